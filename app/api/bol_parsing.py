@@ -1,6 +1,7 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends, BackgroundTasks
 from fastapi.responses import JSONResponse
 from typing import List, Optional
+import asyncio
 import logging
 import json
 
@@ -8,7 +9,7 @@ from app.models.responses import ErrorResponse
 from app.models.bol_responses import BOLParseResponse, BOLBatchParseResponse, BOLPreviewResponse, MultiBOLParseResponse
 from app.models.bol import BOLData, BOLParseRequest
 from app.services.bol_parser import bol_parser
-from app.utils.validation import validate_file, sanitize_filename
+from app.utils.validation import read_validated_file, sanitize_filename
 from app.utils.exceptions import DocumentParserException
 from app.core.config import settings
 
@@ -27,9 +28,9 @@ async def parse_bol(
 ):
     """Parse single BOL (backward compatible - returns first BOL if multiple found)"""
     try:
-        file_content = await file.read()
-
-        validate_file(file_content, file.filename)
+        file_content = await asyncio.to_thread(
+            read_validated_file, file.file, file.size, file.filename
+        )
 
         sanitized_filename = sanitize_filename(file.filename)
 
@@ -82,9 +83,9 @@ async def parse_bol(
 ):
     """Parse multiple BOLs from a single PDF document"""
     try:
-        file_content = await file.read()
-
-        validate_file(file_content, file.filename)
+        file_content = await asyncio.to_thread(
+            read_validated_file, file.file, file.size, file.filename
+        )
 
         sanitized_filename = sanitize_filename(file.filename)
 
@@ -148,10 +149,10 @@ async def parse_batch_bol(
 
         file_data_list = []
         for file in files:
-            file_content = await file.read()
-
             try:
-                validate_file(file_content, file.filename)
+                file_content = await asyncio.to_thread(
+                    read_validated_file, file.file, file.size, file.filename
+                )
             except Exception as e:
                 logger.warning(f"Skipping invalid file {file.filename}: {e}")
                 continue
@@ -201,9 +202,9 @@ async def get_bol_preview(
     expires_in: int = 900
 ):
     try:
-        bols = await bol_parser.storage.list_bols(f"bols/{bol_id}/")
+        bol_path = await anext(bol_parser.storage.list_bols(f"bols/{bol_id}/"), None)
 
-        if not bols:
+        if bol_path is None:
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -213,11 +214,13 @@ async def get_bol_preview(
                 }
             )
 
-        file_name = bols[0].split("/")[-1]
+        file_name = bol_path.split("/")[-1]
 
-        signed_url = await bol_parser.get_bol_preview(
+        signed_url, expires_in = await bol_parser.storage.generate_signed_url_with_expiry(
             bol_id,
-            file_name
+            file_name,
+            expires_in,
+            folder="bols"
         )
 
         return BOLPreviewResponse(
@@ -294,13 +297,11 @@ async def list_bols(
     offset: int = 0
 ):
     try:
-        all_bols = await bol_parser.storage.list_bols("parsed_bol/")
-
-        bol_ids = list(set(
+        bol_ids = list({
             path.split("/")[1]
-            for path in all_bols
+            async for path in bol_parser.storage.list_bols("parsed_bol/")
             if path.endswith("data.json")
-        ))
+        })
 
         paginated = bol_ids[offset:offset + limit]
 
@@ -338,9 +339,9 @@ async def list_bols(
 @router.post("/bol/{bol_id}/reprocess")
 async def reprocess_bol(bol_id: str):
     try:
-        bols = await bol_parser.storage.list_bols(f"bols/{bol_id}/")
+        bol_path = await anext(bol_parser.storage.list_bols(f"bols/{bol_id}/"), None)
 
-        if not bols:
+        if bol_path is None:
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -350,7 +351,7 @@ async def reprocess_bol(bol_id: str):
                 }
             )
 
-        file_name = bols[0].split("/")[-1]
+        file_name = bol_path.split("/")[-1]
         file_content = await bol_parser.storage.download_file(bol_id, file_name, "bols")
 
         document = await bol_parser.document_ai.process_document(
@@ -1,13 +1,14 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException, Form, Depends, BackgroundTasks
 from fastapi.responses import JSONResponse
 from typing import List, Optional
+import asyncio
 import logging
 import json
 
 from app.models.responses import ParseResponse, BatchParseResponse, ErrorResponse, PreviewResponse
 from app.models.invoice import InvoiceData, InvoiceParseRequest
 from app.services.parser import invoice_parser
-from app.utils.validation import validate_file, sanitize_filename
+from app.utils.validation import read_validated_file, sanitize_filename
 from app.utils.exceptions import InvoiceParserException
 from app.core.config import settings
 
@@ -25,9 +26,9 @@ async def parse_invoice(
     language_hints: Optional[str] = Form(default="en")
 ):
     try:
-        file_content = await file.read()
-        
-        validate_file(file_content, file.filename)
+        file_content = await asyncio.to_thread(
+            read_validated_file, file.file, file.size, file.filename
+        )
         
         sanitized_filename = sanitize_filename(file.filename)
         
@@ -90,10 +91,10 @@ async def parse_batch(
         
         file_data_list = []
         for file in files:
-            file_content = await file.read()
-            
             try:
-                validate_file(file_content, file.filename)
+                file_content = await asyncio.to_thread(
+                    read_validated_file, file.file, file.size, file.filename
+                )
             except Exception as e:
                 logger.warning(f"Skipping invalid file {file.filename}: {e}")
                 continue
@@ -143,9 +144,9 @@ async def get_invoice_preview(
     expires_in: int = 900
 ):
     try:
-        invoices = await invoice_parser.storage.list_invoices(f"invoices/{invoice_id}/")
+        invoice_path = await anext(invoice_parser.storage.list_invoices(f"invoices/{invoice_id}/"), None)
         
-        if not invoices:
+        if invoice_path is None:
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -155,11 +156,12 @@ async def get_invoice_preview(
                 }
             )
         
-        file_name = invoices[0].split("/")[-1]
+        file_name = invoice_path.split("/")[-1]
         
-        signed_url = await invoice_parser.get_invoice_preview(
+        signed_url, expires_in = await invoice_parser.storage.generate_signed_url_with_expiry(
             invoice_id,
-            file_name
+            file_name,
+            expires_in
         )
         
         return PreviewResponse(
@@ -236,13 +238,11 @@ async def list_invoices(
     offset: int = 0
 ):
     try:
-        all_invoices = await invoice_parser.storage.list_invoices("parsed/")
-        
-        invoice_ids = list(set(
+        invoice_ids = list({
             path.split("/")[1] 
-            for path in all_invoices 
+            async for path in invoice_parser.storage.list_invoices("parsed/") 
             if path.endswith("data.json")
-        ))
+        })
         
         paginated = invoice_ids[offset:offset + limit]
         
@@ -280,9 +280,9 @@ async def list_invoices(
 @router.post("/invoice/{invoice_id}/reprocess")
 async def reprocess_invoice(invoice_id: str):
     try:
-        invoices = await invoice_parser.storage.list_invoices(f"invoices/{invoice_id}/")
+        invoice_path = await anext(invoice_parser.storage.list_invoices(f"invoices/{invoice_id}/"), None)
         
-        if not invoices:
+        if invoice_path is None:
             raise HTTPException(
                 status_code=404,
                 detail={
@@ -292,7 +292,7 @@ async def reprocess_invoice(invoice_id: str):
                 }
             )
         
-        file_name = invoices[0].split("/")[-1]
+        file_name = invoice_path.split("/")[-1]
         file_content = await invoice_parser.storage.download_file(invoice_id, file_name)
         
         document = await invoice_parser.document_ai.process_document(
@@ -44,10 +44,25 @@ class Settings(BaseSettings):
         default_factory=lambda: [".pdf"],
         description="Allowed file extensions"
     )
+    STRICT_MIME_CHECK: bool = Field(
+        default=False,
+        description="Sniff PDF uploads with libmagic instead of only checking the %PDF- header"
+    )
     
     SIGNED_URL_EXPIRATION: int = Field(default=900, description="Signed URL expiration in seconds")
+    AUTO_CREATE_BUCKET: bool = Field(
+        default=False,
+        description="Check for and create the bucket at startup instead of on first upload"
+    )
     
     BATCH_MAX_WORKERS: int = Field(default=5, description="Max workers for batch processing")
+    THREAD_POOL_SIZE: int = Field(default=32, description="Workers in the shared blocking I/O thread pool")
+    DOCUMENT_AI_BATCHING: bool = Field(
+        default=False,
+        description="Coalesce concurrent invoices into Document AI batch LROs"
+    )
+    DOCUMENT_AI_BATCH_MAX_SIZE: int = Field(default=10, description="Max documents per Document AI batch")
+    DOCUMENT_AI_BATCH_WINDOW_MS: int = Field(default=50, description="Max wait before flushing a Document AI batch")
     REQUEST_TIMEOUT: int = Field(default=300, description="Request timeout in seconds")
     
     REDIS_URL: Optional[str] = Field(None, description="Redis URL for caching")
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 import google.cloud.storage as _gcs
 import google.auth
@@ -8,6 +9,8 @@ import google.auth
 from app.core.config import settings
 from app.core.logging import setup_logging
 from app.api import parsing, bol_parsing
+from app.services.document_ai import document_ai_service
+from app.services.storage import storage_service
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +30,14 @@ async def lifespan(app: FastAPI):
     logger.info(f"Invoice Processor ID: {settings.INVOICE_PROCESSOR_ID or settings.PROCESSOR_ID}")
     logger.info(f"BOL Processor ID: {settings.BOL_PROCESSOR_ID}")
 
+    # Share the storage pool with run_in_executor(None, ...) and asyncio.to_thread
+    asyncio.get_running_loop().set_default_executor(storage_service.executor)
+
     yield
 
     logger.info("Shutting down Document Parsing Service")
+    await document_ai_service.close()
+    await storage_service.close()
 
 # Rest of the code remains the same
 app = FastAPI(
@@ -0,0 +1,62 @@
+import re
+import threading
+from typing import Dict, Sequence
+
+try:
+    import hyperscan
+    HAS_HYPERSCAN = True
+except ImportError:
+    HAS_HYPERSCAN = False
+
+
+class AnchorScanner:
+    """Find the first offset of each literal anchor in a text.
+
+    With Hyperscan installed, all anchors are matched in a single pass over
+    the text; otherwise each anchor is located with ``str.find``. Matching is
+    case-sensitive either way.
+    """
+
+    def __init__(self, anchors: Sequence[str]):
+        self.anchors = tuple(anchors)
+        self._db = None
+        self._local = threading.local()
+
+        if HAS_HYPERSCAN and all(anchor.isascii() for anchor in self.anchors):
+            db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+            db.compile(
+                expressions=[re.escape(anchor).encode() for anchor in self.anchors],
+                ids=list(range(len(self.anchors))),
+                flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(self.anchors)
+            )
+            self._db = db
+
+    def first_offsets(self, text: str) -> Dict[str, int]:
+        """Map each anchor present in text to the offset of its first occurrence"""
+        # Hyperscan reports byte offsets, which only equal str offsets for ASCII
+        if self._db is None or not text.isascii():
+            return self._find_each(text)
+
+        offsets = {}
+
+        def on_match(anchor_id, start, end, flags, context):
+            anchor = self.anchors[anchor_id]
+            offsets[anchor] = end - len(anchor)
+
+        self._db.scan(text.encode('ascii'), match_event_handler=on_match, scratch=self._scratch())
+        return offsets
+
+    def _scratch(self):
+        # Scratch space cannot be shared between concurrent scans
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self._db)
+        return scratch
+
+    def _find_each(self, text: str) -> Dict[str, int]:
+        offsets = {}
+        for anchor in self.anchors:
+            pos = text.find(anchor)
+            if pos != -1:
+                offsets[anchor] = pos
+        return offsets
@@ -0,0 +1,745 @@
+import os
+import re
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Dict, Any, Callable, Optional, List, Sequence, Tuple
+
+from app.models.bol import ShipmentItem
+from app.parsing.anchor_scanner import AnchorScanner
+from app.parsing.byte_scan import HAS_NUMBA, count_span, date_span
+
+try:
+    import re2
+    HAS_RE2 = True
+except ImportError:
+    HAS_RE2 = False
+
+# Items are built from already-typed fields, so full validation is opt-in
+VALIDATE_ITEMS = os.getenv("VALIDATE_ITEMS", "").lower() in ("1", "true", "yes")
+# RE2 guarantees linear-time matching; opt-in until it has seen production text
+USE_RE2 = HAS_RE2 and os.getenv("BOL_REGEX_RE2", "").lower() in ("1", "true", "yes")
+
+# Outside these, Python's \s, \d and IGNORECASE cover more characters than RE2's
+_RE2_UNSAFE_RE = re.compile(r'[\v\x1c-\x1f]')
+_last_checked: Tuple[Optional[str], bool] = (None, False)
+
+
+def _re2_safe(text: str) -> bool:
+    """True when RE2 and re agree on text: ASCII without \\v or \\x1c-\\x1f"""
+    global _last_checked
+    last, safe = _last_checked
+    if last is not text:
+        safe = text.isascii() and _RE2_UNSAFE_RE.search(text) is None
+        _last_checked = (text, safe)
+    return safe
+
+
+class _Re2Pattern:
+    """A compiled pattern that runs on RE2 when the text allows, else on re"""
+
+    __slots__ = ('_re', '_re2', 'pattern', 'flags')
+
+    def __init__(self, rx: re.Pattern):
+        self._re = rx
+        self.pattern = rx.pattern
+        self.flags = rx.flags
+        prefix = '(?i)' if rx.flags & re.IGNORECASE else ''
+        self._re2 = re2.compile(prefix + rx.pattern)
+
+    def search(self, text: str, pos: int = 0):
+        if _re2_safe(text):
+            return self._re2.search(text, pos)
+        return self._re.search(text, pos)
+
+    def match(self, text: str, pos: int = 0):
+        if _re2_safe(text):
+            return self._re2.match(text, pos)
+        return self._re.match(text, pos)
+
+
+def _compile(pattern: str, flags: int = 0):
+    rx = re.compile(pattern, flags)
+    return _Re2Pattern(rx) if USE_RE2 else rx
+
+
+# Patterns are compiled once at import; the extractors run per BOL page
+_BOL_RE = _compile(r'BOL\s*#?\s*([\d]+)')
+_PRO_PATTERNS = (
+    _compile(r'PRO\s*#[\s\n]*DATE[\s\n]+([\d]+)'),  # PRO # DATE <number>
+    _compile(r'PRO\s*#[\s\n]+([\d]+)'),  # PRO # <number>
+)
+_CARRIER_PATTERNS = (
+    _compile(r'NAME OF CARRIER[\s\n]+PRO\s*#[\s\n]+DATE[\s\n]+BOL\s*#[\s\n]+([^\n]+(?:\n[^\d\n][^\n]+)?)'),
+    _compile(r'NAME OF CARRIER[\s\n]+([^\n]+(?:\s*-\s*[^\n]+)?)'),
+)
+_SHIPPER_PATTERNS = (
+    _compile(r'SHIPPER INFORMATION[\s\n]+([A-Z][A-Z\s]+(?:COMPANY|SALES|LLC|INC|CORP)?[^\n]*)'),
+    _compile(r'ORIGIN:[\s\n]+MOTIVATIONAL FULFILLMENT'),
+)
+_ORIGIN_RE = _compile(
+    r'(?:ORIGIN:|MOTIVATIONAL FULFILLMENT)[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})'
+)
+_SHIPPER_CONTACT_RE = _compile(r'(Donna Merlin|[A-Z][a-z]+\s+[A-Z][a-z]+)[\s\n]+(\d{3}[-.]?\d{3}[-.]?\d{4})')
+_CONSIGNEE_PATTERNS = (
+    _compile(r'(\d+)\s*[-–]\s*([^\n]*Scheels)'),  # Format: "58 - Omaha Scheels"
+    _compile(r'CONSIGNEE:[\s\n]+(\d+\s*[-–]\s*[^\n]+)'),
+    _compile(r'CONSIGNEE:[\s\n]+([^\n]+)'),
+)
+_STORE_PREFIX_RE = re.compile(r'^\d+\s*[-–]\s*')
+_CONSIGNEE_ADDR_RE = _compile(
+    r'CONSIGNEE:[\s\n]+[^\n]+[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})'
+)
+_CONSIGNEE_CONTACT_RE = _compile(r'Shipping\s*&?\s*Receiving[\s\n]+(\d{3}[-.]?\d{3}[-.]?\d{4})')
+_FREIGHT_TERMS_RE = _compile(r'FREIGHT CHARGES:\s*(Collect|Prepaid|Third Party)', re.IGNORECASE)
+_BILL_TO_RE = _compile(
+    r'SEND FREIGHT BILL TO:[\s\n]+([^\n]+)[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})'
+)
+_WEIGHT_PATTERNS = (
+    _compile(r'TOTAL[\s\n]+\d+\s+Pallets[\s\n]+(\d+)\s*lbs', re.IGNORECASE),
+    _compile(r'SHIPPING WEIGHT[\s\n]+[^\n]*?(\d+)\s*lbs', re.IGNORECASE),
+)
+_PALLETS_LBS_RE = _compile(r'(\d+)\s+Pallets[\s\n]+\d+\s*lbs', re.IGNORECASE)
+_SPECIAL_RE = _compile(r'\*+Special Instructions\*+[\s\n]+([^\n]+)')
+_BILLING_ID_RE = _compile(r'BILLING ID[\s\n]+(\d+)')
+_CUSTOMER_PO_RE = _compile(r'CUSTOMER PO[\s\n]+(\d+)')
+
+# Patterns used by extract_from_text_fixed
+_ORIGIN_BLOCK_RE = _compile(
+    r'ORIGIN:[\s\n]+([^\n]+)[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})'
+)
+_CONTACT_PATTERNS = (
+    _compile(r'([A-Z][a-z]+\s+[A-Z][a-z]+)[\s\n]+(\d{3}[-.]?\d{3}[-.]?\d{4})'),
+    _compile(r'(\d{3}[-.]?\d{3}[-.]?\d{4})'),  # Just phone
+)
+_CONSIGNEE_BLOCK_ENDS = ('DOCK TYPE', 'ACCESS.', 'DELIVERY #', 'PICK UP #', 'NOTES', 'FREIGHT')
+_STREET_CSZ_RE = _compile(
+    r'(\d+[^\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Boulevard|Blvd|Circle|Way)[^\n]*)'
+    r'(?:[\s\n]+(?:Ste|Suite|Apt|Unit)\s+[^\n]+)?[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})'
+)
+_SUITE_RE = _compile(r'(\d+[^\n]+)[\s\n]+((?:Ste|Suite|Apt|Unit)\s+[^\n]+)')
+_UNIT_WORDS = ('Ste', 'Suite', 'Apt', 'Unit')
+
+
+# Public registry of the compiled patterns, keyed by what they extract, in try order
+PATTERNS: Dict[str, Tuple[re.Pattern, ...]] = {
+    'bol_number': (_BOL_RE,),
+    'pro_number': _PRO_PATTERNS,
+    'carrier_name': _CARRIER_PATTERNS,
+    'shipper_name': _SHIPPER_PATTERNS,
+    'shipper_address': (_ORIGIN_RE,),
+    'shipper_contact': (_SHIPPER_CONTACT_RE,),
+    'consignee_name': _CONSIGNEE_PATTERNS,
+    'consignee_address': (_CONSIGNEE_ADDR_RE,),
+    'consignee_contact': (_CONSIGNEE_CONTACT_RE,),
+    'freight_charge_terms': (_FREIGHT_TERMS_RE,),
+    'bill_to': (_BILL_TO_RE,),
+    'total_weight': _WEIGHT_PATTERNS,
+    'total_pallets': (_PALLETS_LBS_RE,),
+    'special_instructions': (_SPECIAL_RE,),
+    'billing_id': (_BILLING_ID_RE,),
+    'customer_po': (_CUSTOMER_PO_RE,),
+}
+
+_TERMINATORS = ("FREIGHT CHARGES:", "TOTAL", "RECEIVED")
+_ITEM_SECTION_RE = re.compile(r'#\s*PACKAGES[\s\S]*?(?=FREIGHT CHARGES:|TOTAL|RECEIVED|$)', re.IGNORECASE)
+_NMFC_RE = _compile(r'NMFC\s*#([\d-]+)[,\s]+([^,\n]+)')
+_QTY_RE = _compile(r'(\d+)\s+(Pallets?|Cartons?|Boxes?|Pieces?)', re.IGNORECASE)
+_CLASS_RE = _compile(r'CLASS\s*\n?\s*(\d+)')
+_DIM_RE = _compile(r'(\d+)\s*x\s*(\d+)\s*x\s*(\d+)')
+
+# Literal prefixes the anchored patterns above must start with
+_ANCHORS = (
+    'BOL', 'PRO', 'NAME OF CARRIER', 'SHIPPER INFORMATION', 'ORIGIN:',
+    'MOTIVATIONAL FULFILLMENT', 'CONSIGNEE:', 'Shipping', 'SEND FREIGHT BILL TO:',
+    '*', 'BILLING ID', 'CUSTOMER PO',
+)
+
+
+_ANCHOR_SCANNER = AnchorScanner(_ANCHORS)
+
+
+def _index_anchors(text: str) -> Dict[str, int]:
+    """Map each anchor present in text to the offset of its first occurrence"""
+    return _ANCHOR_SCANNER.first_offsets(text)
+
+
+def _search_from(rx: re.Pattern, text: str, pos: Optional[int]) -> Optional[re.Match]:
+    """Search from an anchor offset; a missing anchor means no match"""
+    if pos is None:
+        return None
+    return rx.search(text, pos)
+
+
+def _split_csz(s: str) -> Optional[Tuple[str, str, str]]:
+    """Split 'City, ST 99999' into (city, state, zip), or None if it doesn't fit"""
+    city, sep, tail = s.partition(',')
+    if not sep or not city:
+        return None
+    rest = tail.lstrip()
+    state = rest[:2]
+    if len(state) != 2 or not (state.isascii() and state.isalpha() and state.isupper()):
+        return None
+    after_state = rest[2:]
+    rest = after_state.lstrip()
+    zip_code = rest[:5]
+    if len(rest) == len(after_state) or len(zip_code) != 5 or not zip_code.isdecimal():
+        return None
+    return city, state, zip_code
+
+
+@lru_cache(maxsize=8)
+def _upper(text: str) -> str:
+    """Upper-cased copy of a page, made once and shared by the case-insensitive scans"""
+    return text.upper()
+
+
+@lru_cache(maxsize=8)
+def _upper_bytes(text: str) -> bytes:
+    return _upper(text).encode('ascii')
+
+
+@lru_cache(maxsize=None)
+def _count_re(word: str, min_digits: int) -> re.Pattern:
+    return re.compile(rf'(\d{{{min_digits},}})\s*{word}', re.IGNORECASE)
+
+
+def _find_count(text: str, word: str, min_digits: int = 1) -> Optional[str]:
+    """Digits of the first '<digits><whitespace>*<word>' in text, ignoring case"""
+    if not text.isascii():
+        # Case folding outside ASCII can change offsets; defer to the regex
+        match = _count_re(word, min_digits).search(text)
+        return match.group(1) if match else None
+
+    if HAS_NUMBA:
+        start, end = count_span(_upper_bytes(text), word.upper().encode('ascii'), min_digits)
+        return text[start:end] if start != -1 else None
+
+    upper = _upper(text)
+    word = word.upper()
+    i = upper.find(word)
+    while i != -1:
+        k = i
+        while k > 0 and upper[k - 1].isspace():
+            k -= 1
+        end = k
+        while k > 0 and upper[k - 1].isdigit():
+            k -= 1
+        if end - k >= min_digits:
+            return text[k:end]
+        i = upper.find(word, i + 1)
+    return None
+
+
+def _find_lbs(text: str, min_digits: int = 1) -> Optional[str]:
+    return _find_count(text, 'lbs', min_digits)
+
+
+def _strip_from(s: str, marker: str) -> str:
+    """Drop marker and the rest of the last line, like re.sub(marker + '.*$', '', s)"""
+    body = s[:-1] if s.endswith('\n') else s
+    i = body.find(marker, body.rfind('\n') + 1)
+    return s if i == -1 else body[:i] + s[len(body):]
+
+
+def _find_date(text: str, pos: int = 0) -> Optional[Tuple[int, int]]:
+    """Span of the first M/D/YYYY date at or after pos, as r'\d{1,2}/\d{1,2}/\d{4}' finds it"""
+    if HAS_NUMBA and text.isascii():
+        start, end = date_span(text.encode('ascii'), pos)
+        return (start, end) if start != -1 else None
+
+    j = text.find('/', pos + 1)
+    while j != -1:
+        if text[j - 1].isdecimal():
+            end = _date_tail_end(text, j)
+            if end != -1:
+                start = j - 2 if j - 2 >= pos and text[j - 2].isdecimal() else j - 1
+                return start, end
+        j = text.find('/', j + 1)
+    return None
+
+
+def _date_tail_end(text: str, slash: int) -> int:
+    """End offset of '/D[D]/YYYY' starting at slash, or -1"""
+    for width in (2, 1):
+        day_end = slash + 1 + width
+        day = text[slash + 1:day_end]
+        if len(day) == width and day.isdecimal() and text[day_end:day_end + 1] == '/':
+            year = text[day_end + 1:day_end + 5]
+            if len(year) == 4 and year.isdecimal():
+                return day_end + 5
+    return -1
+
+
+def _strip_trailing_date(s: str) -> str:
+    """Drop an M/D/YYYY date and the rest of the last line"""
+    body = s[:-1] if s.endswith('\n') else s
+    span = _find_date(body, body.rfind('\n') + 1)
+    return s if span is None else body[:span[0]] + s[len(body):]
+
+
+def _strip_care_of(s: str) -> str:
+    """Drop a '/ C/O ...' care-of suffix that runs to the end of the last line"""
+    body = s[:-1] if s.endswith('\n') else s
+    i = body.find('/')
+    while i != -1:
+        j = i + 1
+        while j < len(body) and body[j].isspace():
+            j += 1
+        if body.startswith('C/O', j) and '\n' not in body[j + 3:]:
+            return body[:i] + s[len(body):]
+        i = body.find('/', i + 1)
+    return s
+
+
+def _find_first(text: str, needles: Sequence[str], pos: int) -> int:
+    """Offset of the earliest occurrence of any needle at or after pos, or -1"""
+    ends = [e for e in (text.find(needle, pos) for needle in needles) if e != -1]
+    return min(ends) if ends else -1
+
+
+def _find_consignee_block(text: str, pos: Optional[int]) -> Optional[str]:
+    """Text from after 'CONSIGNEE:' and its whitespace up to the next section heading"""
+    label = 'CONSIGNEE:'
+    while pos is not None and pos != -1:
+        begin = pos + len(label)
+        if begin < len(text) and text[begin].isspace():
+            while begin < len(text) and text[begin].isspace():
+                begin += 1
+            # Later labels cannot find a heading this one missed
+            end = _find_first(text, _CONSIGNEE_BLOCK_ENDS, begin)
+            return text[begin:end] if end != -1 else None
+        pos = text.find(label, pos + 1)
+    return None
+
+
+def _find_item_section(text: str) -> Optional[str]:
+    """Return the text from '# PACKAGES' up to the first terminator, or None"""
+    if not text.isascii():
+        # Case mapping can shift offsets outside ASCII; defer to the regex
+        match = _ITEM_SECTION_RE.search(text)
+        return match.group(0) if match else None
+
+    upper = _upper(text)
+    pos = upper.find('#')
+    while pos != -1:
+        i = pos + 1
+        while i < len(upper) and upper[i].isspace():
+            i += 1
+        if upper.startswith('PACKAGES', i):
+            begin = i + len('PACKAGES')
+            end = _find_first(upper, _TERMINATORS, begin)
+            if end == -1:
+                # '$' also matches just before a trailing newline
+                end = len(text) - 1 if text.endswith('\n') else len(text)
+            return text[pos:end]
+        pos = upper.find('#', pos + 1)
+    return None
+
+
+@dataclass(slots=True, frozen=True)
+class BOLEntities:
+    """Fields extracted from one BOL page; None where the page had no match"""
+    bol_number: Optional[str] = None
+    pro_number: Optional[str] = None
+    carrier_name: Optional[str] = None
+    ship_date: Optional[str] = None
+    shipper_name: Optional[str] = None
+    shipper_street: Optional[str] = None
+    shipper_city: Optional[str] = None
+    shipper_state: Optional[str] = None
+    shipper_zip: Optional[str] = None
+    shipper_contact_name: Optional[str] = None
+    shipper_contact_phone: Optional[str] = None
+    consignee_name: Optional[str] = None
+    consignee_street: Optional[str] = None
+    consignee_city: Optional[str] = None
+    consignee_state: Optional[str] = None
+    consignee_zip: Optional[str] = None
+    consignee_contact_name: Optional[str] = None
+    consignee_contact_phone: Optional[str] = None
+    freight_charge_terms: Optional[str] = None
+    bill_to_name: Optional[str] = None
+    bill_to_street: Optional[str] = None
+    bill_to_city: Optional[str] = None
+    bill_to_state: Optional[str] = None
+    bill_to_zip: Optional[str] = None
+    total_weight: Optional[str] = None
+    total_pallets: Optional[str] = None
+    special_instructions: Optional[str] = None
+    billing_id: Optional[str] = None
+    customer_po: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Found fields only, in the same shape the dict-based extraction returned"""
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def extract_from_text(text: str) -> BOLEntities:
+    """Extract BOL data from raw text using improved patterns"""
+    # Retries and multi-page detection feed the same text through repeatedly;
+    # results are frozen, so the cached instance can be handed out as-is
+    return _extract_cached(text)
+
+
+@lru_cache(maxsize=256)
+def _extract_cached(text: str) -> BOLEntities:
+    # Only valid while the extraction stays a pure function of text
+    return BOLEntities(**BOLView(text).materialize())
+
+
+# Each extractor fills in the entity keys it owns from the page text
+def _extract_bol(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    bol_match = _search_from(_BOL_RE, text, anchors.get('BOL'))
+    if bol_match:
+        entities['bol_number'] = bol_match.group(1)
+
+
+def _extract_pro(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    # Look for PRO # followed by number (may have DATE in between)
+    for rx in _PRO_PATTERNS:
+        pro_match = _search_from(rx, text, anchors.get('PRO'))
+        if pro_match and len(pro_match.group(1)) > 3:  # Ensure it's a real PRO number
+            entities['pro_number'] = pro_match.group(1)
+            break
+
+
+def _extract_carrier(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    for rx in _CARRIER_PATTERNS:
+        carrier_match = _search_from(rx, text, anchors.get('NAME OF CARRIER'))
+        if carrier_match:
+            carrier_text = carrier_match.group(1).strip()
+            # Clean up - remove date patterns and numbers
+            carrier_text = _strip_trailing_date(carrier_text).strip()
+            if carrier_text and 'PRO' not in carrier_text and 'DATE' not in carrier_text:
+                entities['carrier_name'] = carrier_text
+                break
+
+
+def _extract_date(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    span = _find_date(text)
+    if span:
+        entities['ship_date'] = text[span[0]:span[1]]
+
+
+def _extract_shipper_name(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    for rx, anchor in zip(_SHIPPER_PATTERNS, ('SHIPPER INFORMATION', 'ORIGIN:')):
+        shipper_match = _search_from(rx, text, anchors.get(anchor))
+        if shipper_match:
+            if anchor == 'ORIGIN:':
+                entities['shipper_name'] = 'MOTIVATIONAL FULFILLMENT'
+            else:
+                shipper_name = shipper_match.group(1).strip()
+                shipper_name = _strip_care_of(shipper_name).strip()
+                if shipper_name and 'CONSIGNEE' not in shipper_name:
+                    entities['shipper_name'] = shipper_name
+            break
+
+
+def _extract_shipper_address(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    origin_starts = [anchors[a] for a in ('ORIGIN:', 'MOTIVATIONAL FULFILLMENT') if a in anchors]
+    origin_section = _search_from(_ORIGIN_RE, text, min(origin_starts, default=None))
+    if origin_section:
+        entities['shipper_street'] = origin_section.group(1).strip()
+        city_state_zip = origin_section.group(2).strip()
+        city_state_match = _split_csz(city_state_zip)
+        if city_state_match:
+            entities['shipper_city'], entities['shipper_state'], entities['shipper_zip'] = city_state_match
+
+
+def _extract_shipper_contact(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    shipper_contact = _SHIPPER_CONTACT_RE.search(text)
+    if shipper_contact:
+        entities['shipper_contact_name'] = shipper_contact.group(1)
+        entities['shipper_contact_phone'] = shipper_contact.group(2).replace('.', '-')
+
+
+def _extract_consignee_name(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    for i, (rx, anchor) in enumerate(zip(_CONSIGNEE_PATTERNS, (None, 'CONSIGNEE:', 'CONSIGNEE:'))):
+        consignee_match = _search_from(rx, text, 0 if anchor is None else anchors.get(anchor))
+        if consignee_match:
+            if i == 0:  # "<store #> - <name> Scheels"
+                entities['consignee_name'] = consignee_match.group(2).strip()
+            else:
+                consignee_text = consignee_match.group(1).strip()
+                consignee_text = _STORE_PREFIX_RE.sub('', consignee_text)
+                if consignee_text and 'DOCK TYPE' not in consignee_text:
+                    entities['consignee_name'] = consignee_text
+            break
+
+
+def _extract_consignee_address(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    consignee_addr_match = _search_from(_CONSIGNEE_ADDR_RE, text, anchors.get('CONSIGNEE:'))
+    if consignee_addr_match:
+        entities['consignee_street'] = consignee_addr_match.group(1).strip()
+        city_state_zip = consignee_addr_match.group(2).strip()
+        city_state_match = _split_csz(city_state_zip)
+        if city_state_match:
+            entities['consignee_city'], entities['consignee_state'], entities['consignee_zip'] = city_state_match
+
+
+def _extract_consignee_contact(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    consignee_contact = None
+    if 'Receiving' in text:
+        consignee_contact = _search_from(_CONSIGNEE_CONTACT_RE, text, anchors.get('Shipping'))
+    if consignee_contact:
+        entities['consignee_contact_name'] = 'Shipping & Receiving'
+        entities['consignee_contact_phone'] = consignee_contact.group(1).replace('.', '-')
+
+
+def _extract_freight_terms(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    freight_match = _FREIGHT_TERMS_RE.search(text)
+    if freight_match:
+        entities['freight_charge_terms'] = freight_match.group(1).capitalize()
+
+
+def _extract_bill_to(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    bill_to_match = _search_from(_BILL_TO_RE, text, anchors.get('SEND FREIGHT BILL TO:'))
+    if bill_to_match:
+        entities['bill_to_name'] = bill_to_match.group(1).strip()
+        entities['bill_to_street'] = bill_to_match.group(2).strip()
+        city_state_zip = bill_to_match.group(3).strip()
+        city_state_match = _split_csz(city_state_zip)
+        if city_state_match:
+            entities['bill_to_city'], entities['bill_to_state'], entities['bill_to_zip'] = city_state_match
+
+
+def _extract_weight(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    for rx in _WEIGHT_PATTERNS:
+        weight_match = rx.search(text)
+        if weight_match:
+            entities['total_weight'] = weight_match.group(1)
+            return
+    # Last resort: any weight of three or more digits
+    weight = _find_lbs(text, min_digits=3)
+    if weight:
+        entities['total_weight'] = weight
+
+
+def _extract_pallets(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    pallet_match = _PALLETS_LBS_RE.search(text)
+    if pallet_match:
+        entities['total_pallets'] = pallet_match.group(1)
+        return
+    pallets = _find_count(text, 'pallet')
+    if pallets:
+        entities['total_pallets'] = pallets
+
+
+def _extract_special_instructions(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    special_match = None
+    if 'Special Instructions' in text:
+        special_match = _search_from(_SPECIAL_RE, text, anchors.get('*'))
+    if special_match:
+        entities['special_instructions'] = special_match.group(1).strip()
+
+
+def _extract_ids(text: str, anchors: Dict[str, int], entities: Dict[str, Any]):
+    billing_id_match = _search_from(_BILLING_ID_RE, text, anchors.get('BILLING ID'))
+    if billing_id_match:
+        entities['billing_id'] = billing_id_match.group(1)
+
+    customer_po_match = _search_from(_CUSTOMER_PO_RE, text, anchors.get('CUSTOMER PO'))
+    if customer_po_match:
+        entities['customer_po'] = customer_po_match.group(1)
+
+
+# Extractors in output order, with the entity keys each one can produce
+_EXTRACTORS = (
+    (_extract_bol, ('bol_number',)),
+    (_extract_pro, ('pro_number',)),
+    (_extract_carrier, ('carrier_name',)),
+    (_extract_date, ('ship_date',)),
+    (_extract_shipper_name, ('shipper_name',)),
+    (_extract_shipper_address, ('shipper_street', 'shipper_city', 'shipper_state', 'shipper_zip')),
+    (_extract_shipper_contact, ('shipper_contact_name', 'shipper_contact_phone')),
+    (_extract_consignee_name, ('consignee_name',)),
+    (_extract_consignee_address, ('consignee_street', 'consignee_city', 'consignee_state', 'consignee_zip')),
+    (_extract_consignee_contact, ('consignee_contact_name', 'consignee_contact_phone')),
+    (_extract_freight_terms, ('freight_charge_terms',)),
+    (_extract_bill_to, ('bill_to_name', 'bill_to_street', 'bill_to_city', 'bill_to_state', 'bill_to_zip')),
+    (_extract_weight, ('total_weight',)),
+    (_extract_pallets, ('total_pallets',)),
+    (_extract_special_instructions, ('special_instructions',)),
+    (_extract_ids, ('billing_id', 'customer_po')),
+)
+_FIELD_TO_EXTRACTOR = {key: extractor for extractor, keys in _EXTRACTORS for key in keys}
+
+
+class BOLView:
+    """Lazy view over the entities in a BOL page's text.
+
+    Looking up a field runs only the extractor that owns it; results are
+    kept per extractor, so each pattern runs at most once per view.
+    """
+
+    __slots__ = ('_text', '_anchors', '_results')
+
+    def __init__(self, text: str):
+        self._text = text
+        self._anchors: Optional[Dict[str, int]] = None
+        self._results: Dict[Callable, Dict[str, Any]] = {}
+
+    def _run(self, extractor: Callable) -> Dict[str, Any]:
+        result = self._results.get(extractor)
+        if result is None:
+            if self._anchors is None:
+                self._anchors = _index_anchors(self._text)
+            result = {}
+            extractor(self._text, self._anchors, result)
+            self._results[extractor] = result
+        return result
+
+    def __getitem__(self, key: str) -> Any:
+        extractor = _FIELD_TO_EXTRACTOR.get(key)
+        if extractor is None:
+            raise KeyError(key)
+        return self._run(extractor)[key]
+
+    def __contains__(self, key: str) -> bool:
+        extractor = _FIELD_TO_EXTRACTOR.get(key)
+        return extractor is not None and key in self._run(extractor)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def materialize(self) -> Dict[str, Any]:
+        """Run every extractor and return all found fields as a dict"""
+        entities = {}
+        for extractor, _ in _EXTRACTORS:
+            entities.update(self._run(extractor))
+        return entities
+
+
+def _extract_item_fields(item_text: str) -> Dict[str, Any]:
+    item = {}
+
+    # Description with NMFC
+    nmfc_match = _NMFC_RE.search(item_text)
+    if nmfc_match:
+        item['nmfc_code'] = nmfc_match.group(1)
+        item['description'] = nmfc_match.group(2).strip()
+        # Clean up description
+        item['description'] = _strip_from(item['description'], 'PCF').strip()
+
+    # Quantity and type
+    qty_match = _QTY_RE.search(item_text)
+    if qty_match:
+        item['quantity'] = int(qty_match.group(1))
+        item['packaging_type'] = qty_match.group(2).rstrip('s')
+
+    # Weight
+    weight = _find_lbs(item_text)
+    if weight:
+        item['weight'] = float(weight)
+        item['weight_unit'] = "LBS"
+
+    # Class
+    class_match = _CLASS_RE.search(item_text)
+    if class_match:
+        item['freight_class'] = class_match.group(1)
+
+    # Dimensions
+    dim_match = _DIM_RE.search(item_text)
+    if dim_match:
+        item['dimensions'] = f"{dim_match.group(1)}x{dim_match.group(2)}x{dim_match.group(3)}"
+
+    return item
+
+
+def extract_items_from_text(text: str) -> List[Dict[str, Any]]:
+    """Extract shipment items from raw text"""
+    item_text = _find_item_section(text)
+    if item_text is None:
+        return []
+
+    item = _extract_item_fields(item_text)
+    return [item] if item else []
+
+
+def extract_from_text_fixed(text: str) -> Dict[str, Any]:
+    """Extract BOL data with fixed patterns"""
+    entities = {}
+    anchors = _index_anchors(text)
+
+    # Extract shipper info - look for ORIGIN: section
+    origin_section = _search_from(_ORIGIN_BLOCK_RE, text, anchors.get('ORIGIN:'))
+
+    if origin_section:
+        # Extract shipper name (first line after ORIGIN:)
+        entities['shipper_name'] = origin_section.group(1).strip()
+        # Extract street address
+        entities['shipper_street'] = origin_section.group(2).strip()
+        # Extract city, state, zip
+        city_state_zip = origin_section.group(3).strip()
+        city_state_match = _split_csz(city_state_zip)
+        if city_state_match:
+            entities['shipper_city'], entities['shipper_state'], entities['shipper_zip'] = city_state_match
+
+    # Extract shipper contact
+    for i, rx in enumerate(_CONTACT_PATTERNS):
+        shipper_contact = rx.search(text)
+        if shipper_contact:
+            if i == 0:
+                entities['shipper_contact_name'] = shipper_contact.group(1)
+                entities['shipper_contact_phone'] = shipper_contact.group(2).replace('.', '-')
+            else:
+                entities['shipper_contact_phone'] = shipper_contact.group(1).replace('.', '-')
+            break
+
+    # Extract consignee name
+    _extract_consignee_name(text, anchors, entities)
+
+    # Extract complete consignee section
+    consignee_text = _find_consignee_block(text, anchors.get('CONSIGNEE:'))
+
+    if consignee_text is not None:
+
+        # Extract address
+        addr_match = _STREET_CSZ_RE.search(consignee_text) if ',' in consignee_text else None
+
+        if addr_match:
+            street = addr_match.group(1).strip()
+            # Check if there's a suite/apt on the next line
+            suite_match = None
+            if any(word in consignee_text for word in _UNIT_WORDS):
+                suite_match = _SUITE_RE.search(consignee_text)
+            if suite_match and suite_match.group(1) in street:
+                street = f"{street}, {suite_match.group(2).strip()}"
+
+            entities['consignee_street'] = street
+            city_state_zip = addr_match.group(2).strip()
+            city_state_match = _split_csz(city_state_zip)
+            if city_state_match:
+                entities['consignee_city'], entities['consignee_state'], entities['consignee_zip'] = city_state_match
+
+    return entities
+
+
+def _build_item(item_data: dict) -> ShipmentItem:
+    if VALIDATE_ITEMS:
+        return ShipmentItem(**item_data)
+    return ShipmentItem.model_construct(**item_data)
+
+
+def extract_items_from_page_text(page_text: str) -> List[ShipmentItem]:
+    """Extract shipment items from a page as ShipmentItem models"""
+    item_text = _find_item_section(page_text)
+    if item_text is None:
+        return []
+
+    item_data = _extract_item_fields(item_text)
+    if 'quantity' in item_data:
+        # ShipmentItem.quantity is a float; validation would coerce it
+        item_data['quantity'] = float(item_data['quantity'])
+
+    # Only create ShipmentItem if we have a description (required field)
+    if item_data.get('description'):
+        return [_build_item(item_data)]
+    if item_data.get('nmfc_code'):
+        # If we only have NMFC code but no description, use a generic description
+        item_data['description'] = f"Item with NMFC #{item_data['nmfc_code']}"
+        return [_build_item(item_data)]
+    return []
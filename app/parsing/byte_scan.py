@@ -0,0 +1,83 @@
+from typing import Tuple
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+def _jit(func):
+    # Without Numba these stay plain Python; callers only use them when HAS_NUMBA
+    return njit(cache=True)(func) if HAS_NUMBA else func
+
+
+@_jit
+def _is_space(c: int) -> bool:
+    # Every ASCII byte str.isspace() accepts, including the \x1c-\x1f separators
+    return c == 32 or 9 <= c <= 13 or 28 <= c <= 31
+
+
+@_jit
+def _is_digit(c: int) -> bool:
+    return 48 <= c <= 57
+
+
+@_jit
+def count_span(buf: bytes, word: bytes, min_digits: int) -> Tuple[int, int]:
+    """Span of the digits in the first '<digits><whitespace>*<word>' in buf, or (-1, -1)"""
+    n = len(buf)
+    m = len(word)
+    i = 0
+    while i + m <= n:
+        j = 0
+        while j < m and buf[i + j] == word[j]:
+            j += 1
+        if j == m:
+            k = i
+            while k > 0 and _is_space(buf[k - 1]):
+                k -= 1
+            end = k
+            while k > 0 and _is_digit(buf[k - 1]):
+                k -= 1
+            if end - k >= min_digits:
+                return k, end
+        i += 1
+    return -1, -1
+
+
+@_jit
+def date_span(buf: bytes, pos: int) -> Tuple[int, int]:
+    """Span of the first M/D/YYYY date at or after pos, or (-1, -1)"""
+    n = len(buf)
+    j = pos + 1
+    while j < n:
+        if buf[j] == 47 and _is_digit(buf[j - 1]):
+            end = _date_tail_end(buf, j)
+            if end != -1:
+                if j - 2 >= pos and _is_digit(buf[j - 2]):
+                    return j - 2, end
+                return j - 1, end
+        j += 1
+    return -1, -1
+
+
+@_jit
+def _date_tail_end(buf: bytes, slash: int) -> int:
+    n = len(buf)
+    for width in (2, 1):
+        day_end = slash + 1 + width
+        if day_end >= n or buf[day_end] != 47:
+            continue
+        ok = True
+        for k in range(slash + 1, day_end):
+            if not _is_digit(buf[k]):
+                ok = False
+        if not ok or day_end + 5 > n:
+            continue
+        for k in range(day_end + 1, day_end + 5):
+            if not _is_digit(buf[k]):
+                ok = False
+        if ok:
+            return day_end + 5
+    return -1
@@ -327,7 +327,6 @@ class BOLDocumentAIService:
 
     def _extract_from_text(self, text: str) -> Dict[str, Any]:
         """Extract BOL data from raw text using patterns"""
-        import re
         entities = {}
 
         # Extract BOL number - handle both "BOL #" and "BOL #\n" patterns
@@ -596,8 +595,6 @@ class BOLDocumentAIService:
 
         # If no table items found, try text extraction
         if not items:
-            import re
-
             # Look for item section with description, quantity, class, and weight
             item_section = re.search(
                 r'#\s*PACKAGES[\s\S]*?(?=FREIGHT CHARGES:|TOTAL|RECEIVED|$)',
@@ -667,8 +664,6 @@ class BOLDocumentAIService:
 
     def _detect_multiple_bols(self, text: str) -> List[Dict[str, Any]]:
         """Detect and split multiple BOLs in a single document"""
-        import re
-
         # Find all BOL numbers and their positions
         bol_pattern = r'BOL\s*#\s*([\d]+)'
         bol_matches = [(m.group(1), m.start()) for m in re.finditer(bol_pattern, text)]
@@ -698,7 +693,6 @@ class BOLDocumentAIService:
 
     def _extract_from_text_section(self, text: str, bol_number: str) -> Dict[str, Any]:
         """Extract BOL data from a text section for a specific BOL"""
-        import re
         entities = {}
 
         # Set the known BOL number
@@ -762,8 +756,6 @@ class BOLDocumentAIService:
         items = []
 
         # Look for shipment items in the section text
-        import re
-
         # Pattern to find items like "NMFC #15520-05, Athletic or Sporting Goods"
         item_pattern = r'NMFC\s*#[\d-]+,\s*([^,\n]+)'
         item_matches = re.findall(item_pattern, section_text)
@@ -949,6 +941,30 @@ class BOLDocumentAIService:
         if not date_str:
             return None
 
+        date_str = date_str.strip()
+
+        # Fast paths for ISO and slash-separated dates before the strptime fallback
+        if (
+            len(date_str) == 10 and date_str.isascii()
+            and date_str[4] == "-" and date_str[7] == "-"
+            and (date_str[:4] + date_str[5:7] + date_str[8:]).isdecimal()
+        ):
+            # Digits-only fields keep fromisoformat to plain YYYY-MM-DD
+            try:
+                return date.fromisoformat(date_str)
+            except ValueError:
+                pass
+        else:
+            parts = date_str.split("/")
+            if len(parts) == 3 and len(parts[2]) == 4 and all(p.isascii() and p.isdecimal() for p in parts):
+                first, second, year = (int(p) for p in parts)
+                # Same precedence as the format list: MM/DD/YYYY, then DD/MM/YYYY
+                for month, day in ((first, second), (second, first)):
+                    try:
+                        return date(year, month, day)
+                    except ValueError:
+                        continue
+
         date_formats = [
             "%Y-%m-%d",
             "%m/%d/%Y",
@@ -964,7 +980,7 @@ class BOLDocumentAIService:
 
         for fmt in date_formats:
             try:
-                return datetime.strptime(date_str.strip(), fmt).date()
+                return datetime.strptime(date_str, fmt).date()
             except ValueError:
                 continue
 
@@ -1007,16 +1023,19 @@ class BOLDocumentAIService:
 
     def _calculate_confidence_scores(self, document: documentai.Document) -> Dict[str, float]:
         scores = {}
+        total = 0.0
 
         for entity in document.entities:
+            confidence = entity.confidence
+            if not confidence:
+                continue
+
             entity_type = entity.type_.lower().replace(" ", "_")
-            if entity.confidence:
-                scores[entity_type] = entity.confidence
+            # Repeated types overwrite, so keep the running total in step
+            total += confidence - scores.get(entity_type, 0.0)
+            scores[entity_type] = confidence
 
-        if scores:
-            scores["overall"] = sum(scores.values()) / len(scores)
-        else:
-            scores["overall"] = 0.0
+        scores["overall"] = total / len(scores) if scores else 0.0
 
         return scores
 
@@ -93,8 +93,11 @@ class BOLParser:
             # Add metadata to each BOL
             for bol_data in bol_data_list:
                 bol_data.metadata.update(metadata)
-                # Save each BOL's data
-                await self.save_bol_data(bol_data.bol_id, bol_data)
+
+            # Save each BOL's data concurrently
+            await asyncio.gather(
+                *(self.save_bol_data(bol_data.bol_id, bol_data) for bol_data in bol_data_list)
+            )
 
             # Generate preview URL for the original document
             preview_url = await self.get_bol_preview(document_id, file_name)
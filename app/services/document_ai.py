@@ -7,33 +7,98 @@ from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from datetime import datetime, date
 import re
+import uuid
 
 from app.core.config import settings
 from app.models.invoice import InvoiceData, InvoiceLineItem, Address
+from app.services.storage import storage_service
+from app.utils.batching import AsyncBatchProcessor
 from app.utils.exceptions import DocumentAIError
 
 logger = logging.getLogger(__name__)
 
+_TEXT_ANCHOR = documentai.Document.TextAnchor.pb().DESCRIPTOR
+
+
+def _shift_text_anchors(message, offset: int):
+    # Anchors sit at many depths (page layouts, tables, form fields,
+    # entity properties), so walk the whole message
+    if message.DESCRIPTOR is _TEXT_ANCHOR:
+        for segment in message.text_segments:
+            segment.start_index += offset
+            segment.end_index += offset
+        return
+    
+    for field, value in message.ListFields():
+        if field.type != field.TYPE_MESSAGE or field.message_type.GetOptions().map_entry:
+            continue
+        if field.label == field.LABEL_REPEATED:
+            for item in value:
+                _shift_text_anchors(item, offset)
+        else:
+            _shift_text_anchors(value, offset)
+
+
+def _merge_shards(shards: List[documentai.Document]) -> documentai.Document:
+    """Join a sharded batch output back into one document, in shard order"""
+    shards = [documentai.Document.pb(shard) for shard in shards]
+    shards.sort(key=lambda shard: shard.shard_info.shard_index)
+    
+    expected = shards[0].shard_info.shard_count
+    if expected != len(shards):
+        raise DocumentAIError(f"Batch output has {len(shards)} of {expected} shards")
+    
+    merged = type(shards[0])(mime_type=shards[0].mime_type, uri=shards[0].uri)
+    text_parts = []
+    text_length = 0
+    
+    for shard in shards:
+        # Each shard's anchors index its own text, which starts at text_offset
+        offset = shard.shard_info.text_offset
+        if offset != text_length:
+            raise DocumentAIError(
+                f"Shard {shard.shard_info.shard_index} starts at {offset}, expected {text_length}"
+            )
+        _shift_text_anchors(shard, offset)
+        
+        text_parts.append(shard.text)
+        text_length += len(shard.text)
+        merged.pages.extend(shard.pages)
+        merged.entities.extend(shard.entities)
+        merged.entity_relations.extend(shard.entity_relations)
+        merged.text_styles.extend(shard.text_styles)
+    
+    merged.text = "".join(text_parts)
+    return documentai.Document.wrap(merged)
+
 
 class DocumentAIService:
     def __init__(self):
         self.project_id = settings.PROJECT_ID
         self.location = settings.PROCESSOR_LOCATION
         self.processor_id = settings.INVOICE_PROCESSOR_ID or settings.PROCESSOR_ID
-        self.client: Optional[documentai.DocumentProcessorServiceClient] = None
+        self.client: Optional[documentai.DocumentProcessorServiceAsyncClient] = None
         self.executor = ThreadPoolExecutor(max_workers=3)
+        self._batcher: Optional[AsyncBatchProcessor] = None
         
     def initialize(self):
         try:
             opts = ClientOptions(
                 api_endpoint=f"{self.location}-documentai.googleapis.com"
             )
-            self.client = documentai.DocumentProcessorServiceClient(client_options=opts)
+            # Native asyncio gRPC client; calls multiplex over one HTTP/2 channel
+            self.client = documentai.DocumentProcessorServiceAsyncClient(client_options=opts)
             logger.info("Document AI client initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize Document AI client: {e}")
             raise DocumentAIError(f"Document AI initialization failed: {str(e)}")
     
+    async def close(self):
+        # Let queued batch requests finish before the client goes away
+        if self._batcher is not None:
+            await self._batcher.aclose()
+            self._batcher = None
+    
     async def process_document(
         self, 
         content: bytes,
@@ -43,32 +108,128 @@ class DocumentAIService:
             if not self.client:
                 self.initialize()
             
-            loop = asyncio.get_event_loop()
-            document = await loop.run_in_executor(
-                self.executor,
-                self._process_document_sync,
-                content,
-                mime_type
+            request = documentai.ProcessRequest(
+                name=await self._get_processor_name(),
+                raw_document=documentai.RawDocument(
+                    content=content,
+                    mime_type=mime_type
+                )
             )
             
-            return document
+            result = await self.client.process_document(request=request)
+            return result.document
             
         except Exception as e:
             logger.error(f"Document processing failed: {e}")
             raise DocumentAIError(f"Failed to process document: {str(e)}")
     
-    def _process_document_sync(
-        self, 
-        content: bytes,
-        mime_type: str
+    async def process_gcs_document(
+        self,
+        gcs_uri: str,
+        mime_type: str = "application/pdf"
     ) -> documentai.Document:
+        """Process a document already in GCS, coalescing concurrent calls into batch LROs."""
+        try:
+            if not self.client:
+                self.initialize()
+            if not self._batcher:
+                self._batcher = AsyncBatchProcessor(
+                    self._process_gcs_batch,
+                    max_batch=settings.DOCUMENT_AI_BATCH_MAX_SIZE,
+                    window_ms=settings.DOCUMENT_AI_BATCH_WINDOW_MS
+                )
+            
+            return await self._batcher.submit((gcs_uri, mime_type))
+            
+        except Exception as e:
+            logger.error(f"Batch document processing failed: {e}")
+            raise DocumentAIError(f"Failed to process document: {str(e)}")
+    
+    async def _process_gcs_batch(self, items: List[Tuple[str, str]]) -> List[Any]:
+        output_uri = f"gs://{settings.BUCKET_NAME}/docai-batch/{uuid.uuid4()}/"
+        
+        request = documentai.BatchProcessRequest(
+            name=await self._get_processor_name(),
+            input_documents=documentai.BatchDocumentsInputConfig(
+                gcs_documents=documentai.GcsDocuments(
+                    documents=[
+                        documentai.GcsDocument(gcs_uri=gcs_uri, mime_type=mime_type)
+                        for gcs_uri, mime_type in items
+                    ]
+                )
+            ),
+            document_output_config=documentai.DocumentOutputConfig(
+                gcs_output_config=documentai.DocumentOutputConfig.GcsOutputConfig(
+                    gcs_uri=output_uri
+                )
+            )
+        )
+        
+        logger.info(f"Submitting Document AI batch of {len(items)} documents")
+        operation = await self.client.batch_process_documents(request=request)
+        await operation.result(timeout=settings.REQUEST_TIMEOUT)
+        metadata = documentai.BatchProcessMetadata(operation.metadata)
+        
+        # Reading the output documents back goes through the sync GCS client
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            self._collect_batch_results,
+            metadata,
+            items
+        )
+    
+    def _collect_batch_results(
+        self,
+        metadata: documentai.BatchProcessMetadata,
+        items: List[Tuple[str, str]]
+    ) -> List[Any]:
+        results = {}
+        for status in metadata.individual_process_statuses:
+            try:
+                if status.status.code != 0:
+                    raise DocumentAIError(status.status.message)
+                results[status.input_gcs_source] = self._read_batch_output(status.output_gcs_destination)
+            except Exception as e:
+                results[status.input_gcs_source] = e
+        
+        return [
+            results[gcs_uri] if gcs_uri in results else DocumentAIError(f"No batch result for {gcs_uri}")
+            for gcs_uri, _ in items
+        ]
+    
+    def _read_batch_output(self, gcs_uri: str) -> documentai.Document:
+        if not storage_service.client:
+            storage_service.initialize()
+        
+        bucket_name, _, prefix = gcs_uri[len("gs://"):].partition("/")
+        bucket = storage_service.client.bucket(bucket_name)
+        shards = [blob for blob in bucket.list_blobs(prefix=prefix) if blob.name.endswith(".json")]
+        
+        if not shards:
+            raise DocumentAIError(f"No batch output found at {gcs_uri}")
+        
+        documents = [
+            documentai.Document.from_json(blob.download_as_bytes(), ignore_unknown_fields=True)
+            for blob in shards
+        ]
+        
+        for blob in shards:
+            blob.delete()
+        
+        # Large documents come back split into shards
+        if len(documents) == 1:
+            return documents[0]
+        return _merge_shards(documents)
+    
+    async def _get_processor_name(self) -> str:
         if not self.processor_id:
             processor_name = f"projects/{self.project_id}/locations/{self.location}/processors"
             
-            processors = self.client.list_processors(parent=processor_name)
+            processors = await self.client.list_processors(parent=processor_name)
             invoice_processor = None
             
-            for processor in processors:
+            async for processor in processors:
                 if "invoice" in processor.display_name.lower():
                     invoice_processor = processor
                     self.processor_id = processor.name.split("/")[-1]
@@ -77,7 +238,7 @@ class DocumentAIService:
             
             if not invoice_processor:
                 logger.info("No invoice processor found, creating one...")
-                processor = self.client.create_processor(
+                processor = await self.client.create_processor(
                     parent=processor_name,
                     processor=documentai.Processor(
                         display_name="Invoice Parser",
@@ -87,24 +248,11 @@ class DocumentAIService:
                 self.processor_id = processor.name.split("/")[-1]
                 logger.info(f"Created processor: {self.processor_id}")
         
-        name = self.client.processor_path(
+        return self.client.processor_path(
             self.project_id,
             self.location,
             self.processor_id
         )
-        
-        raw_document = documentai.RawDocument(
-            content=content,
-            mime_type=mime_type
-        )
-        
-        request = documentai.ProcessRequest(
-            name=name,
-            raw_document=raw_document
-        )
-        
-        result = self.client.process_document(request=request)
-        return result.document
     
     async def extract_invoice_data(
         self, 
@@ -162,34 +310,38 @@ class DocumentAIService:
     def _extract_entities(self, document: documentai.Document) -> Dict[str, Any]:
         entities = {}
         
-        for entity in document.entities:
+        # Iterate the raw protobuf messages to skip the proto-plus wrappers
+        for entity in document._pb.entities:
             entity_type = entity.type_.lower().replace(" ", "_")
+            mention_text = entity.mention_text
             
-            if entity.mention_text:
-                entities[entity_type] = entity.mention_text
+            if mention_text:
+                entities[entity_type] = mention_text
             else:
-                entities[entity_type] = entity.text_anchor.content if entity.text_anchor else None
+                entities[entity_type] = entity.text_anchor.content if entity.HasField("text_anchor") else None
             
-            if entity.properties:
-                for prop in entity.properties:
-                    prop_type = f"{entity_type}_{prop.type_.lower().replace(' ', '_')}"
-                    if prop.mention_text:
-                        entities[prop_type] = prop.mention_text
-                    elif prop.text_anchor:
-                        entities[prop_type] = prop.text_anchor.content
+            for prop in entity.properties:
+                prop_type = f"{entity_type}_{prop.type_.lower().replace(' ', '_')}"
+                prop_text = prop.mention_text
+                if prop_text:
+                    entities[prop_type] = prop_text
+                elif prop.HasField("text_anchor"):
+                    entities[prop_type] = prop.text_anchor.content
         
         return entities
     
     def _extract_line_items(self, document: documentai.Document) -> List[InvoiceLineItem]:
         line_items = []
         
-        for entity in document.entities:
+        pb = document._pb
+        
+        for entity in pb.entities:
             if entity.type_.lower() == "line_item":
                 item_data = {}
                 
                 for prop in entity.properties:
                     prop_type = prop.type_.lower().replace(" ", "_")
-                    value = prop.mention_text or (prop.text_anchor.content if prop.text_anchor else None)
+                    value = prop.mention_text or (prop.text_anchor.content if prop.HasField("text_anchor") else None)
                     
                     if prop_type in ["amount", "unit_price", "tax_amount"]:
                         item_data[prop_type] = self._parse_amount(value)
@@ -211,12 +363,11 @@ class DocumentAIService:
                     )
                     line_items.append(line_item)
         
-        if not line_items and document.pages:
-            for page in document.pages:
-                if page.tables:
-                    for table in page.tables:
-                        table_items = self._extract_items_from_table(table)
-                        line_items.extend(table_items)
+        if not line_items:
+            for page in pb.pages:
+                for table in page.tables:
+                    table_items = self._extract_items_from_table(table)
+                    line_items.extend(table_items)
         
         return line_items
     
@@ -226,17 +377,16 @@ class DocumentAIService:
         if not table.header_rows or not table.body_rows:
             return items
         
+        # table is a raw protobuf message; unset fields read as empty strings
         headers = []
         for cell in table.header_rows[0].cells:
-            header_text = cell.layout.text_anchor.content if cell.layout and cell.layout.text_anchor else ""
-            headers.append(header_text.lower().strip())
+            headers.append(cell.layout.text_anchor.content.lower().strip())
         
         for row in table.body_rows:
             row_data = {}
             for idx, cell in enumerate(row.cells):
                 if idx < len(headers):
-                    cell_text = cell.layout.text_anchor.content if cell.layout and cell.layout.text_anchor else ""
-                    row_data[headers[idx]] = cell_text.strip()
+                    row_data[headers[idx]] = cell.layout.text_anchor.content.strip()
             
             if row_data:
                 item = self._parse_table_row_to_line_item(row_data)
@@ -283,6 +433,30 @@ class DocumentAIService:
         if not date_str:
             return None
         
+        date_str = date_str.strip()
+        
+        # Fast paths for ISO and slash-separated dates before the strptime fallback
+        if (
+            len(date_str) == 10 and date_str.isascii()
+            and date_str[4] == "-" and date_str[7] == "-"
+            and (date_str[:4] + date_str[5:7] + date_str[8:]).isdecimal()
+        ):
+            # Digits-only fields keep fromisoformat to plain YYYY-MM-DD
+            try:
+                return date.fromisoformat(date_str)
+            except ValueError:
+                pass
+        else:
+            parts = date_str.split("/")
+            if len(parts) == 3 and len(parts[2]) == 4 and all(p.isascii() and p.isdecimal() for p in parts):
+                first, second, year = (int(p) for p in parts)
+                # Same precedence as the format list: MM/DD/YYYY, then DD/MM/YYYY
+                for month, day in ((first, second), (second, first)):
+                    try:
+                        return date(year, month, day)
+                    except ValueError:
+                        continue
+        
         date_formats = [
             "%Y-%m-%d",
             "%m/%d/%Y",
@@ -296,7 +470,7 @@ class DocumentAIService:
         
         for fmt in date_formats:
             try:
-                return datetime.strptime(date_str.strip(), fmt).date()
+                return datetime.strptime(date_str, fmt).date()
             except ValueError:
                 continue
         
@@ -341,16 +515,19 @@ class DocumentAIService:
     
     def _calculate_confidence_scores(self, document: documentai.Document) -> Dict[str, float]:
         scores = {}
+        total = 0.0
         
-        for entity in document.entities:
+        for entity in document._pb.entities:
+            confidence = entity.confidence
+            if not confidence:
+                continue
+            
             entity_type = entity.type_.lower().replace(" ", "_")
-            if entity.confidence:
-                scores[entity_type] = entity.confidence
+            # Repeated types overwrite, so keep the running total in step
+            total += confidence - scores.get(entity_type, 0.0)
+            scores[entity_type] = confidence
         
-        if scores:
-            scores["overall"] = sum(scores.values()) / len(scores)
-        else:
-            scores["overall"] = 0.0
+        scores["overall"] = total / len(scores) if scores else 0.0
         
         return scores
 
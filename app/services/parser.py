@@ -2,8 +2,11 @@ import logging
 from typing import List, Dict, Any, Optional
 import asyncio
 from datetime import datetime
+from decimal import Decimal
 import time
+import uuid
 
+from app.core.config import settings
 from app.models.invoice import InvoiceData
 from app.models.responses import ParseResponse, BatchParseResponse
 from app.services.storage import storage_service
@@ -13,6 +16,10 @@ from app.utils.exceptions import ParseError, ValidationError
 logger = logging.getLogger(__name__)
 
 
+# Totals may differ from the sum of their parts by a rounding cent
+AMOUNT_TOLERANCE = Decimal("0.01")
+
+
 class InvoiceParser:
     def __init__(self):
         self.storage = storage_service
@@ -36,7 +43,6 @@ class InvoiceParser:
             logger.info(f"Starting invoice parsing for file: {file_name}")
 
             # Generate invoice ID
-            import uuid
             invoice_id = str(uuid.uuid4())
 
             await self.storage.upload_file(
@@ -49,10 +55,16 @@ class InvoiceParser:
             )
             logger.info(f"File uploaded with invoice ID: {invoice_id}")
             
-            document = await self.document_ai.process_document(
-                file_content,
-                content_type
-            )
+            if settings.DOCUMENT_AI_BATCHING:
+                document = await self.document_ai.process_gcs_document(
+                    f"gs://{self.storage.bucket_name}/invoices/{invoice_id}/{file_name}",
+                    content_type
+                )
+            else:
+                document = await self.document_ai.process_document(
+                    file_content,
+                    content_type
+                )
             logger.info(f"Document processed successfully")
             
             invoice_data = await self.document_ai.extract_invoice_data(
@@ -204,9 +216,7 @@ class InvoiceParser:
         invoice_data: InvoiceData
     ) -> Optional[str]:
         try:
-            existing_invoices = await self.storage.list_invoices("parsed/")
-            
-            for invoice_path in existing_invoices:
+            async for invoice_path in self.storage.list_invoices("parsed/"):
                 if not invoice_path.endswith("data.json"):
                     continue
                 
@@ -232,7 +242,7 @@ class InvoiceParser:
         
         if invoice_data.subtotal and invoice_data.tax_amount:
             calculated_total = invoice_data.subtotal + invoice_data.tax_amount
-            if abs(calculated_total - invoice_data.total_amount) > 0.01:
+            if abs(calculated_total - invoice_data.total_amount) > AMOUNT_TOLERANCE:
                 errors.append("Total amount doesn't match subtotal + tax")
         
         if invoice_data.invoice_date and invoice_data.due_date:
@@ -241,7 +251,7 @@ class InvoiceParser:
         
         if invoice_data.line_items:
             line_total = sum(item.amount for item in invoice_data.line_items)
-            if invoice_data.subtotal and abs(line_total - invoice_data.subtotal) > 0.01:
+            if invoice_data.subtotal and abs(line_total - invoice_data.subtotal) > AMOUNT_TOLERANCE:
                 errors.append("Line items total doesn't match subtotal")
         
         confidence_score = invoice_data.confidence_scores.get("overall", 0)
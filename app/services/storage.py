@@ -1,33 +1,91 @@
 from google.cloud import storage
-from google.cloud.exceptions import NotFound
+from gcloud.aio.storage import Storage
 from google.auth.transport.requests import Request
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from google.auth import iam
+from google.oauth2 import service_account
 import google.auth
+import aiohttp
 import logging
+import random
+import requests
+import threading
+import time
 import uuid
-from typing import Optional, Dict, Any
-from datetime import timedelta
-import json
+from collections import OrderedDict
+from typing import Optional, Dict, Any, AsyncIterator, Awaitable, Callable, Tuple
+from datetime import datetime, timedelta
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
 
 from app.core.config import settings
 from app.utils.exceptions import StorageError
-from app.utils.json_encoder import dumps_invoice_data
+from app.utils.json_encoder import dumps_invoice_data_bytes, loads_invoice_data
 
 logger = logging.getLogger(__name__)
 
 SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
 
+# Keep-alive connections held open to GCS, shared by every call in the process
+HTTP_POOL_SIZE = 64
+
+# Max concurrent delete requests, matching the GCS JSON batch limit
+DELETE_BATCH_SIZE = 100
+
+# Signed URLs are reused until this fraction of their lifetime has elapsed
+SIGNED_URL_REUSE_FRACTION = 0.8
+SIGNED_URL_CACHE_SIZE = 10_000
+
+# Transient GCS failures are retried with exponential backoff plus jitter
+RETRY_ATTEMPTS = 3
+RETRY_MAX_DELAY = 32
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+
+# Refresh the access token this long before it actually expires
+TOKEN_REFRESH_MARGIN = timedelta(seconds=60)
+
+
+def _is_not_found(error: Exception) -> bool:
+    return isinstance(error, aiohttp.ClientResponseError) and error.status == 404
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status in RETRYABLE_STATUSES
+    return isinstance(error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+async def _retry(fn: Callable[..., Awaitable[Any]], *args, max_attempts: int = RETRY_ATTEMPTS, **kwargs) -> Any:
+    for attempt in range(max_attempts):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            if attempt == max_attempts - 1 or not _is_retryable(e):
+                raise
+            delay = min(RETRY_MAX_DELAY, 2 ** attempt + random.random())
+            logger.warning(f"GCS call failed ({e}), retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+
+
 class StorageService:
     def __init__(self):
+        # Sync client is kept for bucket setup and signed URL generation only;
+        # object reads and writes go through the asyncio client
         self.client: Optional[storage.Client] = None
         self.bucket: Optional[storage.Bucket] = None
-        self.executor = ThreadPoolExecutor(max_workers=5)
+        self.aio_client: Optional[Storage] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self.executor = ThreadPoolExecutor(max_workers=settings.THREAD_POOL_SIZE)
         self.bucket_name = settings.BUCKET_NAME
         self.project_id = settings.PROJECT_ID
         self._credentials = None
+        self._signing_credentials: Optional[service_account.Credentials] = None
         self._request: Optional[Request] = None
+        self._url_cache: "OrderedDict[Tuple[str, str, int], Tuple[str, float]]" = OrderedDict()
+        self._url_cache_lock = threading.Lock()
+        self._token_lock = threading.Lock()
+        self._bucket_verified = False
 
     def initialize(self):
         try:
@@ -36,28 +94,64 @@ class StorageService:
             if not self.project_id:
                 self.project_id = detected_project
 
-            # Create a Request() for refresh + IAM signer
-            self._request = Request()
+            # Create a Request() for refresh + IAM signer, pooled like the client
+            adapter = self._http_adapter()
+            http = requests.Session()
+            http.mount("https://", adapter)
+            self._request = Request(session=http)
+
+            # A service account key (GOOGLE_APPLICATION_CREDENTIALS) can sign
+            # URLs locally, skipping the token refresh and IAM round-trip
+            if isinstance(self._credentials, service_account.Credentials):
+                self._signing_credentials = self._credentials
 
             self.client = storage.Client(
                 project=self.project_id, credentials=self._credentials
             )
+            self.client._http.mount("https://", adapter)
             self.bucket = self.client.bucket(self.bucket_name)
 
-            if not self.bucket.exists():
-                logger.warning(f"Bucket {self.bucket_name} does not exist. Creating...")
-                self.bucket = self.client.create_bucket(
-                    self.bucket_name,
-                    location="US",
-                )
-                logger.info(f"Bucket {self.bucket_name} created successfully")
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=HTTP_POOL_SIZE,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60,
+                ),
+                timeout=aiohttp.ClientTimeout(total=settings.REQUEST_TIMEOUT),
+            )
+            self.aio_client = Storage(session=self._session)
+
+            # Skip the existence round-trip on cold start unless asked for;
+            # a missing bucket is otherwise created on the first failed upload
+            if settings.AUTO_CREATE_BUCKET:
+                self._ensure_bucket()
             else:
-                logger.info(f"Connected to bucket: {self.bucket_name}")
+                logger.info(f"Using bucket: {self.bucket_name}")
 
         except Exception as e:
             logger.error(f"Failed to initialize storage service: {e}")
             raise StorageError(f"Storage initialization failed: {str(e)}")
 
+    @staticmethod
+    def _http_adapter() -> HTTPAdapter:
+        return HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+        )
+
+    def _ensure_bucket(self):
+        if not self.bucket.exists():
+            logger.warning(f"Bucket {self.bucket_name} does not exist. Creating...")
+            self.bucket = self.client.create_bucket(
+                self.bucket_name,
+                location="US",
+            )
+            logger.info(f"Bucket {self.bucket_name} created successfully")
+        else:
+            logger.info(f"Connected to bucket: {self.bucket_name}")
+        self._bucket_verified = True
+
     def _fresh_access_token(self) -> str:
         # Ensure we have a fresh OAuth access token; required for IAM-backed signing
         if self._credentials is None:
@@ -65,8 +159,17 @@ class StorageService:
         if self._request is None:
             self._request = Request()
 
-        self._credentials.refresh(self._request)
-        return self._credentials.token
+        # One refresh per expiry: signing threads queue on the lock and reuse it
+        with self._token_lock:
+            if self._token_expiring():
+                self._credentials.refresh(self._request)
+            return self._credentials.token
+
+    def _token_expiring(self) -> bool:
+        if not self._credentials.valid:
+            return True
+        expiry = self._credentials.expiry
+        return expiry is not None and expiry - datetime.utcnow() < TOKEN_REFRESH_MARGIN
 
     async def upload_file(
         self,
@@ -80,10 +183,7 @@ class StorageService:
         try:
             blob_name = f"{folder}/{document_id}/{file_name}"
 
-            loop = asyncio.get_event_loop()
-            blob_path = await loop.run_in_executor(
-                self.executor,
-                self._upload_to_gcs,
+            blob_path = await self._upload_to_gcs(
                 file_content,
                 blob_name,
                 content_type,
@@ -97,51 +197,70 @@ class StorageService:
             logger.error(f"Failed to upload file: {e}")
             raise StorageError(f"File upload failed: {str(e)}")
 
-    def _upload_to_gcs(
+    async def _upload_to_gcs(
         self,
         content: bytes,
         blob_name: str,
         content_type: str,
         metadata: Optional[Dict[str, Any]] = None,
     ) -> str:
-        blob = self.bucket.blob(blob_name)
-        if metadata:
-            blob.metadata = metadata
-        blob.upload_from_string(content, content_type=content_type)
-        return blob.name
+        try:
+            # The aio client rejects bytearray/memoryview, and its per-call
+            # timeout (30s) would otherwise cut large uploads short
+            response = await _retry(
+                self.aio_client.upload,
+                self.bucket_name,
+                blob_name,
+                bytes(content),
+                content_type=content_type,
+                metadata={"metadata": metadata} if metadata else None,
+                timeout=settings.REQUEST_TIMEOUT,
+            )
+        except Exception as e:
+            if self._bucket_verified or not _is_not_found(e):
+                raise
+
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(self.executor, self._ensure_bucket)
+            return await self._upload_to_gcs(content, blob_name, content_type, metadata)
+
+        self._bucket_verified = True
+        return response["name"]
 
     async def download_file(self, document_id: str, file_name: str, folder: str = "invoices") -> bytes:
         try:
             blob_name = f"{folder}/{document_id}/{file_name}"
 
-            loop = asyncio.get_event_loop()
-            content = await loop.run_in_executor(
-                self.executor,
-                self._download_from_gcs,
-                blob_name,
-            )
-            return content
+            return await self._download_from_gcs(blob_name)
 
-        except NotFound:
-            logger.error(f"File not found: {blob_name}")
-            raise StorageError(f"File not found: {document_id}/{file_name}")
         except Exception as e:
+            if _is_not_found(e):
+                logger.error(f"File not found: {blob_name}")
+                raise StorageError(f"File not found: {document_id}/{file_name}")
             logger.error(f"Failed to download file: {e}")
             raise StorageError(f"File download failed: {str(e)}")
 
-    def _download_from_gcs(self, blob_name: str) -> bytes:
-        blob = self.bucket.blob(blob_name)
-        return blob.download_as_bytes()
+    async def _download_from_gcs(self, blob_name: str) -> bytes:
+        return await _retry(
+            self.aio_client.download,
+            self.bucket_name,
+            blob_name,
+            timeout=settings.REQUEST_TIMEOUT,
+        )
 
     async def save_parsed_data(self, document_id: str, data: Dict[str, Any], folder: str = "parsed") -> str:
         try:
             blob_name = f"{folder}/{document_id}/data.json"
-            json_content = dumps_invoice_data(data).encode("utf-8")
 
+            # Encode on the pool so concurrent saves keep uploading meanwhile
             loop = asyncio.get_event_loop()
-            blob_path = await loop.run_in_executor(
+            json_content = await loop.run_in_executor(
                 self.executor,
-                self._upload_to_gcs,
+                dumps_invoice_data_bytes,
+                data,
+            )
+
+            blob_path = await self._upload_to_gcs(
                 json_content,
                 blob_name,
                 "application/json",
@@ -159,18 +278,13 @@ class StorageService:
         try:
             blob_name = f"{folder}/{document_id}/data.json"
 
-            loop = asyncio.get_event_loop()
-            content = await loop.run_in_executor(
-                self.executor,
-                self._download_from_gcs,
-                blob_name,
-            )
-            return json.loads(content)
+            content = await self._download_from_gcs(blob_name)
+            return loads_invoice_data(content)
 
-        except NotFound:
-            logger.error(f"Parsed data not found for document: {document_id}")
-            raise StorageError(f"Parsed data not found: {document_id}")
         except Exception as e:
+            if _is_not_found(e):
+                logger.error(f"Parsed data not found for document: {document_id}")
+                raise StorageError(f"Parsed data not found: {document_id}")
             logger.error(f"Failed to get parsed data: {e}")
             raise StorageError(f"Failed to retrieve parsed data: {str(e)}")
 
@@ -181,40 +295,95 @@ class StorageService:
         expiration: int = None,
         folder: str = "invoices"
     ) -> str:
+        signed_url, _ = await self.generate_signed_url_with_expiry(
+            document_id, file_name, expiration, folder
+        )
+        return signed_url
+
+    async def generate_signed_url_with_expiry(
+        self,
+        document_id: str,
+        file_name: str,
+        expiration: int = None,
+        folder: str = "invoices"
+    ) -> Tuple[str, int]:
+        # A cached URL has less than the full expiration left; report what remains
         try:
             blob_name = f"{folder}/{document_id}/{file_name}"
             expiration = expiration or settings.SIGNED_URL_EXPIRATION
 
-            loop = asyncio.get_event_loop()
-            signed_url = await loop.run_in_executor(
-                self.executor,
-                self._generate_signed_url,
-                blob_name,
-                expiration,
-            )
-            return signed_url
+            cached = self._get_cached_signed_url((blob_name, "GET", expiration))
+            if cached is None:
+                loop = asyncio.get_event_loop()
+                cached = await loop.run_in_executor(
+                    self.executor,
+                    self._generate_signed_url,
+                    blob_name,
+                    expiration,
+                )
+
+            signed_url, signed_at = cached
+            return signed_url, int(expiration - (time.monotonic() - signed_at))
 
         except Exception as e:
             logger.error(f"Failed to generate signed URL: {e}")
             raise StorageError(f"Failed to generate signed URL: {str(e)}")
 
-    def _generate_signed_url(self, blob_name: str, expiration: int) -> str:
+    def _get_cached_signed_url(self, cache_key: Tuple[str, str, int]) -> Optional[Tuple[str, float]]:
+        with self._url_cache_lock:
+            cached = self._url_cache.get(cache_key)
+            if cached is None:
+                return None
+
+            url, signed_at = cached
+            if time.monotonic() - signed_at >= cache_key[2] * SIGNED_URL_REUSE_FRACTION:
+                del self._url_cache[cache_key]
+                return None
+
+            self._url_cache.move_to_end(cache_key)
+            return url, signed_at
+
+    def _generate_signed_url(self, blob_name: str, expiration: int) -> Tuple[str, float]:
+        cache_key = (blob_name, "GET", expiration)
+        cached = self._get_cached_signed_url(cache_key)
+        if cached is not None:
+            return cached
+
+        signed_at = time.monotonic()
+        url = self._sign_url(blob_name, expiration)
+
+        with self._url_cache_lock:
+            self._url_cache[cache_key] = (url, signed_at)
+            self._url_cache.move_to_end(cache_key)
+            if len(self._url_cache) > SIGNED_URL_CACHE_SIZE:
+                self._url_cache.popitem(last=False)
+
+        return url, signed_at
+
+    def _sign_url(self, blob_name: str, expiration: int) -> str:
         if self.bucket is None:
             raise StorageError("Storage service not initialized")
 
         blob = self.bucket.blob(blob_name)
         logger.info(f"[sign] generating V4 URL for: {blob_name}")
+
+        exp = timedelta(seconds=expiration)
+
+        if self._signing_credentials is not None:
+            return blob.generate_signed_url(
+                version="v4",
+                expiration=exp,
+                method="GET",
+                credentials=self._signing_credentials,
+            )
+
         logger.info(f"[sign] SERVICE_ACCOUNT_EMAIL={settings.SERVICE_ACCOUNT_EMAIL!r}")
 
         if not settings.SERVICE_ACCOUNT_EMAIL:
             raise StorageError("SERVICE_ACCOUNT_EMAIL environment variable not set!")
 
     # Ensure request + creds exist and are fresh
-        if self._request is None:
-         self._request = Request()
-        self._credentials.refresh(self._request)
-
-        exp = timedelta(seconds=expiration)
+        access_token = self._fresh_access_token()
 
     # ---- Path A: token + email (preferred) ----
         try:
@@ -224,7 +393,7 @@ class StorageService:
              expiration=exp,
                 method="GET",  # use "PUT" for uploads and add content_type
              service_account_email=settings.SERVICE_ACCOUNT_EMAIL,
-             access_token=self._credentials.token,
+             access_token=access_token,
         )
             logger.info("[sign] PATH A succeeded")
             return url
@@ -233,7 +402,6 @@ class StorageService:
 
     # ---- Path B: explicit IAM Signer (fallback) ----
         try:
-            from google.auth import iam
             logger.info("[sign] PATH B: iam.Signer fallback")
             signer = iam.Signer(
                 request=self._request,
@@ -253,42 +421,40 @@ class StorageService:
             raise StorageError(f"Failed to generate signed URL: {e}")
 
 
-    async def list_invoices(self, prefix: Optional[str] = None) -> list:
+    async def list_invoices(self, prefix: Optional[str] = None) -> AsyncIterator[str]:
         try:
             prefix = prefix or "invoices/"
 
-            loop = asyncio.get_event_loop()
-            blobs = await loop.run_in_executor(
-                self.executor,
-                self._list_blobs,
-                prefix,
-            )
-            return blobs
+            async for name in self._iter_blobs(prefix):
+                yield name
 
         except Exception as e:
             logger.error(f"Failed to list invoices: {e}")
             raise StorageError(f"Failed to list invoices: {str(e)}")
 
-    def _list_blobs(self, prefix: str) -> list:
-        blobs = self.bucket.list_blobs(prefix=prefix)
-        return [blob.name for blob in blobs]
+    async def _iter_blobs(self, prefix: str) -> AsyncIterator[str]:
+        # Yields each page as it arrives; the next page is only fetched on demand
+        params = {"prefix": prefix}
+
+        while True:
+            page = await _retry(self.aio_client.list_objects, self.bucket_name, params=params)
+            for item in page.get("items", []):
+                yield item["name"]
+
+            if not page.get("nextPageToken"):
+                return
+            params["pageToken"] = page["nextPageToken"]
+
+    async def _list_blobs(self, prefix: str) -> list:
+        return [name async for name in self._iter_blobs(prefix)]
 
     async def delete_invoice(self, invoice_id: str):
         try:
             prefix = f"invoices/{invoice_id}/"
-
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                self.executor,
-                self._delete_blobs,
-                prefix,
-            )
-
             parsed_prefix = f"parsed/{invoice_id}/"
-            await loop.run_in_executor(
-                self.executor,
-                self._delete_blobs,
-                parsed_prefix,
+            await asyncio.gather(
+                self._delete_blobs(prefix),
+                self._delete_blobs(parsed_prefix),
             )
 
             logger.info(f"Invoice {invoice_id} deleted successfully")
@@ -297,23 +463,22 @@ class StorageService:
             logger.error(f"Failed to delete invoice: {e}")
             raise StorageError(f"Failed to delete invoice: {str(e)}")
 
-    def _delete_blobs(self, prefix: str):
-        blobs = self.bucket.list_blobs(prefix=prefix)
-        for blob in blobs:
-            blob.delete()
-            logger.debug(f"Deleted blob: {blob.name}")
+    async def _delete_blobs(self, prefix: str):
+        blob_names = await self._list_blobs(prefix)
 
-    async def list_bols(self, prefix: Optional[str] = None) -> list:
+        for start in range(0, len(blob_names), DELETE_BATCH_SIZE):
+            chunk = blob_names[start:start + DELETE_BATCH_SIZE]
+            await asyncio.gather(
+                *(_retry(self.aio_client.delete, self.bucket_name, name) for name in chunk)
+            )
+            logger.debug(f"Deleted {len(chunk)} blobs under {prefix}")
+
+    async def list_bols(self, prefix: Optional[str] = None) -> AsyncIterator[str]:
         try:
             prefix = prefix or "bols/"
 
-            loop = asyncio.get_event_loop()
-            blobs = await loop.run_in_executor(
-                self.executor,
-                self._list_blobs,
-                prefix,
-            )
-            return blobs
+            async for name in self._iter_blobs(prefix):
+                yield name
 
         except Exception as e:
             logger.error(f"Failed to list BOLs: {e}")
@@ -322,19 +487,10 @@ class StorageService:
     async def delete_bol(self, bol_id: str):
         try:
             prefix = f"bols/{bol_id}/"
-
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(
-                self.executor,
-                self._delete_blobs,
-                prefix,
-            )
-
             parsed_prefix = f"parsed_bol/{bol_id}/"
-            await loop.run_in_executor(
-                self.executor,
-                self._delete_blobs,
-                parsed_prefix,
+            await asyncio.gather(
+                self._delete_blobs(prefix),
+                self._delete_blobs(parsed_prefix),
             )
 
             logger.info(f"BOL {bol_id} deleted successfully")
@@ -343,5 +499,12 @@ class StorageService:
             logger.error(f"Failed to delete BOL: {e}")
             raise StorageError(f"Failed to delete BOL: {str(e)}")
 
+    async def close(self):
+        # The aio client does not close a session it was handed
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self.aio_client = None
+
 
 storage_service = StorageService()
@@ -0,0 +1,113 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncBatchProcessor:
+    """Coalesce concurrent submissions into batches for a single downstream call.
+
+    A batch is flushed when ``max_batch`` items are queued or ``window_ms``
+    has elapsed since the first item arrived, whichever comes first. The
+    handler receives the list of items and must return one result per item,
+    in order; an ``Exception`` instance in the result list is raised to that
+    item's caller only.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch: int = 10,
+        window_ms: int = 50
+    ):
+        self.handler = handler
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # The loop only keeps weak references to tasks, so in-flight
+        # dispatches are held here until they finish
+        self._dispatches: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        self._ensure_started()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.window
+
+            try:
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            finally:
+                # Also runs when aclose() cancels the loop mid-collection
+                self._start_dispatch(batch)
+
+    def _start_dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        logger.debug(f"Flushing batch of {len(batch)} items")
+        task = asyncio.get_running_loop().create_task(self._dispatch(batch))
+        self._dispatches.add(task)
+        task.add_done_callback(self._dispatch_done)
+
+    def _dispatch_done(self, task: asyncio.Task):
+        self._dispatches.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Batch dispatch failed: {task.exception()}")
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+
+        try:
+            results = await self.handler(items)
+        except Exception as e:
+            results = [e] * len(batch)
+
+        if len(results) != len(batch):
+            error = RuntimeError(f"Batch handler returned {len(results)} results for {len(batch)} items")
+            results = [error] * len(batch)
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def aclose(self):
+        """Dispatch anything still queued, wait for in-flight batches and stop the flush loop."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        while self._queue is not None and not self._queue.empty():
+            batch = []
+            while len(batch) < self.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            self._start_dispatch(batch)
+
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
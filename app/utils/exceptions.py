@@ -1,4 +1,6 @@
 class DocumentParserException(Exception):
+    __slots__ = ("message", "code")
+
     def __init__(self, message: str, code: str = "UNKNOWN_ERROR"):
         self.message = message
         self.code = code
@@ -6,46 +8,62 @@ class DocumentParserException(Exception):
 
 
 class InvoiceParserException(DocumentParserException):
-    pass
+    __slots__ = ()
 
 
 class DocumentAIError(InvoiceParserException):
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message, "DOCUMENT_AI_ERROR")
 
 
 class StorageError(InvoiceParserException):
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message, "STORAGE_ERROR")
 
 
 class ValidationError(InvoiceParserException):
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message, "VALIDATION_ERROR")
 
 
 class ParseError(InvoiceParserException):
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message, "PARSE_ERROR")
 
 
 class AuthenticationError(InvoiceParserException):
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message, "AUTH_ERROR")
 
 
 class RateLimitError(InvoiceParserException):
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message, "RATE_LIMIT_ERROR")
 
 
 class FileTypeError(ValidationError):
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message)
         self.code = "INVALID_FILE_TYPE"
 
 
 class FileSizeError(ValidationError):
+    __slots__ = ()
+
     def __init__(self, message: str):
         super().__init__(message)
         self.code = "FILE_SIZE_EXCEEDED"
\ No newline at end of file
@@ -1,7 +1,13 @@
 import json
 from decimal import Decimal
 from datetime import date, datetime
-from typing import Any
+from typing import Any, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 
 class InvoiceJSONEncoder(json.JSONEncoder):
@@ -23,11 +29,40 @@ class InvoiceJSONEncoder(json.JSONEncoder):
         return super().default(obj)
 
 
+def _orjson_default(obj: Any) -> Any:
+    """Fallback for types orjson does not serialize natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    elif isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    elif hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    elif hasattr(obj, "__dict__"):
+        return obj.__dict__
+
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_invoice_data_bytes(data: dict) -> bytes:
+    """Serialize invoice data to UTF-8 encoded JSON bytes with custom encoder."""
+    if HAS_ORJSON:
+        return orjson.dumps(
+            data,
+            default=_orjson_default,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        )
+
+    return json.dumps(data, cls=InvoiceJSONEncoder, indent=2).encode("utf-8")
+
+
 def dumps_invoice_data(data: dict) -> str:
     """Serialize invoice data to JSON string with custom encoder."""
-    return json.dumps(data, cls=InvoiceJSONEncoder, indent=2)
+    return dumps_invoice_data_bytes(data).decode("utf-8")
+
 
+def loads_invoice_data(json_str: Union[str, bytes]) -> dict:
+    """Deserialize JSON string or UTF-8 bytes to invoice data dictionary."""
+    if HAS_ORJSON:
+        return orjson.loads(json_str)
 
-def loads_invoice_data(json_str: str) -> dict:
-    """Deserialize JSON string to invoice data dictionary."""
     return json.loads(json_str)
\ No newline at end of file
@@ -1,14 +1,34 @@
 import os
-from typing import BinaryIO, Optional
+import re
+import string
+from typing import BinaryIO, Iterator, Optional
 import hashlib
 from app.core.config import settings
 from app.utils.exceptions import FileTypeError, FileSizeError, ValidationError
 
-try:
-    import magic
-    HAS_MAGIC = True
-except ImportError:
-    HAS_MAGIC = False
+# Bytes read up front for the file type check before streaming the rest
+HEADER_SIZE = 2048
+STREAM_CHUNK_SIZE = 1024 * 1024
+
+# libmagic parses its database on import, so it is loaded on first use
+_magic_module = None
+
+_EMAIL_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + "._%+-")
+_EMAIL_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + ".-")
+_PHONE_CLEAN_RE = re.compile(r'[^\d+\-\(\)\s]')
+_SAFE_FN_RE = re.compile(r'[^\w\s\-\.]')
+_WS_RE = re.compile(r'[\s]+')
+
+
+def _load_magic():
+    global _magic_module
+    if _magic_module is None:
+        try:
+            import magic
+            _magic_module = magic
+        except ImportError:
+            _magic_module = False
+    return _magic_module or None
 
 
 def validate_file(
@@ -29,7 +49,14 @@ def validate_file(
             f"File type '{file_ext}' not allowed. Allowed types: {', '.join(settings.ALLOWED_EXTENSIONS)}"
         )
     
-    if HAS_MAGIC:
+    # A .pdf with a %PDF- header is settled without invoking libmagic
+    if file_ext == ".pdf" and not settings.STRICT_MIME_CHECK:
+        if memoryview(file_content)[:5] != b'%PDF-':
+            raise FileTypeError("Invalid file content. Expected PDF file")
+        return True
+    
+    magic = _load_magic()
+    if magic is not None:
         try:
             mime = magic.from_buffer(file_content[:2048], mime=True)
             if mime != "application/pdf":
@@ -42,12 +69,66 @@ def validate_file(
             else:
                 raise
     else:
-        if file_content[:4] != b'%PDF':
+        if memoryview(file_content)[:5] != b'%PDF-':
             raise FileTypeError("Invalid file content. Expected PDF file")
     
     return True
 
 
+def validate_file_stream(
+    fp: BinaryIO,
+    content_length: Optional[int],
+    file_name: str,
+    max_size: Optional[int] = None
+) -> Iterator[bytes]:
+    """Validate an upload without buffering it, returning an iterator over its chunks.
+
+    The declared length, extension and header are checked before anything is
+    returned; the iterator raises FileSizeError as soon as the bytes actually
+    read go past max_size.
+    """
+    max_size = max_size or settings.MAX_FILE_SIZE
+    
+    if content_length is not None and content_length > max_size:
+        raise FileSizeError(
+            f"File size ({content_length} bytes) exceeds maximum allowed size ({max_size} bytes)"
+        )
+    
+    header = bytearray()
+    while len(header) < HEADER_SIZE:
+        chunk = fp.read(HEADER_SIZE - len(header))
+        if not chunk:
+            break
+        header += chunk
+    
+    validate_file(bytes(header), file_name, max_size)
+    
+    return _iter_file_stream(fp, bytes(header), max_size)
+
+
+def read_validated_file(
+    fp: BinaryIO,
+    content_length: Optional[int],
+    file_name: str,
+    max_size: Optional[int] = None
+) -> bytes:
+    """Validate an upload and read all of it; blocking, so run it off the event loop."""
+    return b"".join(validate_file_stream(fp, content_length, file_name, max_size))
+
+
+def _iter_file_stream(fp: BinaryIO, header: bytes, max_size: int) -> Iterator[bytes]:
+    total_read = len(header)
+    yield header
+    
+    for chunk in iter(lambda: fp.read(STREAM_CHUNK_SIZE), b""):
+        total_read += len(chunk)
+        if total_read > max_size:
+            raise FileSizeError(
+                f"File size exceeds maximum allowed size ({max_size} bytes)"
+            )
+        yield chunk
+
+
 def validate_invoice_number(invoice_number: str) -> bool:
     if not invoice_number:
         return False
@@ -59,25 +140,35 @@ def validate_invoice_number(invoice_number: str) -> bool:
 
 
 def validate_email(email: str) -> bool:
-    import re
-    
     if not email:
         return True
     
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(pattern, email):
+    if not _is_valid_email(email):
         raise ValidationError(f"Invalid email format: {email}")
     
     return True
 
 
-def validate_phone(phone: str) -> bool:
-    import re
+def _is_valid_email(email: str) -> bool:
+    # Linear scan equivalent of ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$
+    local, at, domain = email.partition("@")
+    host, dot, tld = domain.rpartition(".")
+    if not (at and local and dot and host) or len(tld) < 2:
+        return False
     
+    return (
+        tld.isascii()
+        and tld.isalpha()
+        and _EMAIL_LOCAL_CHARS.issuperset(local)
+        and _EMAIL_DOMAIN_CHARS.issuperset(host)
+    )
+
+
+def validate_phone(phone: str) -> bool:
     if not phone:
         return True
     
-    cleaned = re.sub(r'[^\d+\-\(\)\s]', '', phone)
+    cleaned = _PHONE_CLEAN_RE.sub('', phone)
     
     if len(cleaned) < 7 or len(cleaned) > 20:
         raise ValidationError(f"Invalid phone number: {phone}")
@@ -90,12 +181,10 @@ def calculate_file_hash(file_content: bytes) -> str:
 
 
 def sanitize_filename(filename: str) -> str:
-    import re
-    
     filename = os.path.basename(filename)
     
-    filename = re.sub(r'[^\w\s\-\.]', '', filename)
+    filename = _SAFE_FN_RE.sub('', filename)
     
-    filename = re.sub(r'[\s]+', '_', filename)
+    filename = _WS_RE.sub('_', filename)
     
     return filename[:255]
\ No newline at end of file
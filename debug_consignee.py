@@ -3,6 +3,17 @@
 
 import re
 
+CONSIGNEE_BLOCK_RE = re.compile(
+    r'CONSIGNEE:[\s\n]+([\s\S]*?)(?:DOCK TYPE|ACCESS\.|DELIVERY #|PICK UP #|NOTES|FREIGHT|Shipping)'
+)
+ADDRESS_RE = re.compile(
+    r'(\d+[^\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Boulevard|Blvd|Circle|Way)[^\n]*)(?:[\s\n]+(?:Ste|Suite|Apt|Unit)\s+[^\n]+)?[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})'
+)
+STREET_RE = re.compile(r'(\d+[^\n]+)')
+CONSIGNEE_ADDRESS_RE = re.compile(
+    r'CONSIGNEE:[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})'
+)
+
 test_text = """58 - Omaha Scheels
 CONSIGNEE:
 17202 Davenport Street
@@ -17,10 +28,7 @@ print(test_text)
 print("-" * 40)
 
 # Test the pattern
-consignee_block = re.search(
-    r'CONSIGNEE:[\s\n]+([\s\S]*?)(?:DOCK TYPE|ACCESS\.|DELIVERY #|PICK UP #|NOTES|FREIGHT|Shipping)',
-    test_text
-)
+consignee_block = CONSIGNEE_BLOCK_RE.search(test_text)
 
 if consignee_block:
     print(f"✅ Consignee block found:")
@@ -29,10 +37,7 @@ if consignee_block:
     consignee_text = consignee_block.group(1)
 
     # Test address pattern
-    addr_match = re.search(
-        r'(\d+[^\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Boulevard|Blvd|Circle|Way)[^\n]*)(?:[\s\n]+(?:Ste|Suite|Apt|Unit)\s+[^\n]+)?[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})',
-        consignee_text
-    )
+    addr_match = ADDRESS_RE.search(consignee_text)
 
     if addr_match:
         print(f"\n✅ Address match found:")
@@ -41,17 +46,14 @@ if consignee_block:
     else:
         print("\n❌ No address match")
         print("\nTrying simpler pattern:")
-        simple_match = re.search(r'(\d+[^\n]+)', consignee_text)
+        simple_match = STREET_RE.search(consignee_text)
         if simple_match:
             print(f"  Found: {simple_match.group(1)}")
 else:
     print("❌ No consignee block found")
 
 print("\nTrying alternate approach - capture everything:")
-alt_match = re.search(
-    r'CONSIGNEE:[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})',
-    test_text
-)
+alt_match = CONSIGNEE_ADDRESS_RE.search(test_text)
 if alt_match:
     print(f"✅ Alternate match:")
     print(f"  Street: {alt_match.group(1)}")
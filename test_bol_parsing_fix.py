@@ -1,236 +1,7 @@
 #!/usr/bin/env python3
 """Test script to verify BOL parsing improvements"""
 
-import re
-from typing import Dict, Any, Optional, List
-from app.models.bol import BOLData, ShipmentItem, Address
-
-def extract_from_text(text: str) -> Dict[str, Any]:
-    """Extract BOL data from raw text using improved patterns"""
-    entities = {}
-
-    # Extract BOL number
-    bol_match = re.search(r'BOL\s*#?\s*([\d]+)', text)
-    if bol_match:
-        entities['bol_number'] = bol_match.group(1)
-
-    # Extract PRO number - look for PRO # followed by number (may have DATE in between)
-    pro_patterns = [
-        r'PRO\s*#[\s\n]*DATE[\s\n]+([\d]+)',  # PRO # DATE <number>
-        r'PRO\s*#[\s\n]+([\d]+)',  # PRO # <number>
-    ]
-    for pattern in pro_patterns:
-        pro_match = re.search(pattern, text)
-        if pro_match and len(pro_match.group(1)) > 3:  # Ensure it's a real PRO number
-            entities['pro_number'] = pro_match.group(1)
-            break
-
-    # Extract carrier name
-    carrier_patterns = [
-        r'NAME OF CARRIER[\s\n]+PRO\s*#[\s\n]+DATE[\s\n]+BOL\s*#[\s\n]+([^\n]+(?:\n[^\d\n][^\n]+)?)',
-        r'NAME OF CARRIER[\s\n]+([^\n]+(?:\s*-\s*[^\n]+)?)',
-    ]
-    for pattern in carrier_patterns:
-        carrier_match = re.search(pattern, text)
-        if carrier_match:
-            carrier_text = carrier_match.group(1).strip()
-            # Clean up - remove date patterns and numbers
-            carrier_text = re.sub(r'\d{1,2}/\d{1,2}/\d{4}.*$', '', carrier_text).strip()
-            if carrier_text and 'PRO' not in carrier_text and 'DATE' not in carrier_text:
-                entities['carrier_name'] = carrier_text
-                break
-
-    # Extract date
-    date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', text)
-    if date_match:
-        entities['ship_date'] = date_match.group(1)
-
-    # Extract shipper info
-    shipper_patterns = [
-        r'SHIPPER INFORMATION[\s\n]+([A-Z][A-Z\s]+(?:COMPANY|SALES|LLC|INC|CORP)?[^\n]*)',
-        r'ORIGIN:[\s\n]+MOTIVATIONAL FULFILLMENT',
-    ]
-
-    for pattern in shipper_patterns:
-        shipper_match = re.search(pattern, text)
-        if shipper_match:
-            if 'ORIGIN:' in pattern:
-                entities['shipper_name'] = 'MOTIVATIONAL FULFILLMENT'
-            else:
-                shipper_name = shipper_match.group(1).strip()
-                shipper_name = re.sub(r'/\s*C\/O.*$', '', shipper_name).strip()
-                if shipper_name and 'CONSIGNEE' not in shipper_name:
-                    entities['shipper_name'] = shipper_name
-            break
-
-    # Extract full shipper address
-    origin_section = re.search(
-        r'(?:ORIGIN:|MOTIVATIONAL FULFILLMENT)[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})',
-        text
-    )
-    if origin_section:
-        entities['shipper_street'] = origin_section.group(1).strip()
-        city_state_zip = origin_section.group(2).strip()
-        city_state_match = re.match(r'([^,]+),\s*([A-Z]{2})\s+(\d{5})', city_state_zip)
-        if city_state_match:
-            entities['shipper_city'] = city_state_match.group(1)
-            entities['shipper_state'] = city_state_match.group(2)
-            entities['shipper_zip'] = city_state_match.group(3)
-
-    # Extract shipper contact
-    shipper_contact = re.search(r'(Donna Merlin|[A-Z][a-z]+\s+[A-Z][a-z]+)[\s\n]+(\d{3}[-.]?\d{3}[-.]?\d{4})', text)
-    if shipper_contact:
-        entities['shipper_contact_name'] = shipper_contact.group(1)
-        entities['shipper_contact_phone'] = shipper_contact.group(2).replace('.', '-')
-
-    # Extract consignee info
-    consignee_patterns = [
-        r'(\d+)\s*[-–]\s*([^\n]*Scheels)',  # Format: "58 - Omaha Scheels"
-        r'CONSIGNEE:[\s\n]+(\d+\s*[-–]\s*[^\n]+)',
-        r'CONSIGNEE:[\s\n]+([^\n]+)',
-    ]
-    for pattern in consignee_patterns:
-        consignee_match = re.search(pattern, text)
-        if consignee_match:
-            if len(consignee_match.groups()) > 1 and 'Scheels' in pattern:
-                entities['consignee_name'] = consignee_match.group(2).strip()
-            else:
-                consignee_text = consignee_match.group(1).strip()
-                consignee_text = re.sub(r'^\d+\s*[-–]\s*', '', consignee_text)
-                if consignee_text and 'DOCK TYPE' not in consignee_text:
-                    entities['consignee_name'] = consignee_text
-            break
-
-    # Extract consignee address
-    consignee_addr_match = re.search(
-        r'CONSIGNEE:[\s\n]+[^\n]+[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})',
-        text
-    )
-    if consignee_addr_match:
-        entities['consignee_street'] = consignee_addr_match.group(1).strip()
-        city_state_zip = consignee_addr_match.group(2).strip()
-        city_state_match = re.match(r'([^,]+),\s*([A-Z]{2})\s+(\d{5})', city_state_zip)
-        if city_state_match:
-            entities['consignee_city'] = city_state_match.group(1)
-            entities['consignee_state'] = city_state_match.group(2)
-            entities['consignee_zip'] = city_state_match.group(3)
-
-    # Extract consignee contact
-    consignee_contact = re.search(r'Shipping\s*&?\s*Receiving[\s\n]+(\d{3}[-.]?\d{3}[-.]?\d{4})', text)
-    if consignee_contact:
-        entities['consignee_contact_name'] = 'Shipping & Receiving'
-        entities['consignee_contact_phone'] = consignee_contact.group(1).replace('.', '-')
-
-    # Extract freight charge terms
-    freight_match = re.search(r'FREIGHT CHARGES:\s*(Collect|Prepaid|Third Party)', text, re.IGNORECASE)
-    if freight_match:
-        entities['freight_charge_terms'] = freight_match.group(1).capitalize()
-
-    # Extract Bill To
-    bill_to_match = re.search(
-        r'SEND FREIGHT BILL TO:[\s\n]+([^\n]+)[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})',
-        text
-    )
-    if bill_to_match:
-        entities['bill_to_name'] = bill_to_match.group(1).strip()
-        entities['bill_to_street'] = bill_to_match.group(2).strip()
-        city_state_zip = bill_to_match.group(3).strip()
-        city_state_match = re.match(r'([^,]+),\s*([A-Z]{2})\s+(\d{5})', city_state_zip)
-        if city_state_match:
-            entities['bill_to_city'] = city_state_match.group(1)
-            entities['bill_to_state'] = city_state_match.group(2)
-            entities['bill_to_zip'] = city_state_match.group(3)
-
-    # Extract weight and pallets
-    weight_patterns = [
-        r'TOTAL[\s\n]+\d+\s+Pallets[\s\n]+(\d+)\s*lbs',
-        r'SHIPPING WEIGHT[\s\n]+[^\n]*?(\d+)\s*lbs',
-        r'(\d{3,})\s*lbs',
-    ]
-    for pattern in weight_patterns:
-        weight_match = re.search(pattern, text, re.IGNORECASE)
-        if weight_match:
-            entities['total_weight'] = weight_match.group(1)
-            break
-
-    pallet_patterns = [
-        r'(\d+)\s+Pallets[\s\n]+\d+\s*lbs',
-        r'(\d+)\s*Pallets?',
-    ]
-    for pattern in pallet_patterns:
-        pallet_match = re.search(pattern, text, re.IGNORECASE)
-        if pallet_match:
-            entities['total_pallets'] = pallet_match.group(1)
-            break
-
-    # Extract special instructions
-    special_match = re.search(r'\*+Special Instructions\*+[\s\n]+([^\n]+)', text)
-    if special_match:
-        entities['special_instructions'] = special_match.group(1).strip()
-
-    # Extract additional IDs
-    billing_id_match = re.search(r'BILLING ID[\s\n]+(\d+)', text)
-    if billing_id_match:
-        entities['billing_id'] = billing_id_match.group(1)
-
-    customer_po_match = re.search(r'CUSTOMER PO[\s\n]+(\d+)', text)
-    if customer_po_match:
-        entities['customer_po'] = customer_po_match.group(1)
-
-    return entities
-
-
-def extract_items_from_text(text: str) -> List[Dict[str, Any]]:
-    """Extract shipment items from raw text"""
-    items = []
-
-    # Look for item section
-    item_section = re.search(
-        r'#\s*PACKAGES[\s\S]*?(?=FREIGHT CHARGES:|TOTAL|RECEIVED|$)',
-        text,
-        re.IGNORECASE
-    )
-
-    if item_section:
-        item_text = item_section.group(0)
-
-        item = {}
-
-        # Description with NMFC
-        nmfc_match = re.search(r'NMFC\s*#([\d-]+)[,\s]+([^,\n]+)', item_text)
-        if nmfc_match:
-            item['nmfc_code'] = nmfc_match.group(1)
-            item['description'] = nmfc_match.group(2).strip()
-            # Clean up description
-            item['description'] = re.sub(r'PCF.*$', '', item['description']).strip()
-
-        # Quantity and type
-        qty_match = re.search(r'(\d+)\s+(Pallets?|Cartons?|Boxes?|Pieces?)', item_text, re.IGNORECASE)
-        if qty_match:
-            item['quantity'] = int(qty_match.group(1))
-            item['packaging_type'] = qty_match.group(2).rstrip('s')
-
-        # Weight
-        weight_match = re.search(r'(\d+)\s*lbs', item_text, re.IGNORECASE)
-        if weight_match:
-            item['weight'] = float(weight_match.group(1))
-            item['weight_unit'] = "LBS"
-
-        # Class
-        class_match = re.search(r'CLASS\s*\n?\s*(\d+)', item_text)
-        if class_match:
-            item['freight_class'] = class_match.group(1)
-
-        # Dimensions
-        dim_match = re.search(r'(\d+)\s*x\s*(\d+)\s*x\s*(\d+)', item_text)
-        if dim_match:
-            item['dimensions'] = f"{dim_match.group(1)}x{dim_match.group(2)}x{dim_match.group(3)}"
-
-        if item:
-            items.append(item)
-
-    return items
-
+from app.parsing.bol_regex import BOLView, extract_items_from_text
 
 # Test with the problematic BOL raw text
 raw_text = """STRAIGHT BILL OF LADING - Master
@@ -302,7 +73,7 @@ TOTAL
 print("Testing BOL parsing improvements...")
 print("=" * 60)
 
-entities = extract_from_text(raw_text)
+entities = BOLView(raw_text)
 items = extract_items_from_text(raw_text)
 
 print("\n✅ EXTRACTED ENTITIES:")
@@ -4,68 +4,10 @@
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Run items through full pydantic validation, which the service skips by default
+os.environ.setdefault("VALIDATE_ITEMS", "1")
 
-import re
-from app.models.bol import ShipmentItem
-
-def extract_items_from_page_text(page_text: str):
-    """Simulate the fixed extraction logic"""
-    items = []
-
-    # Look for item section
-    item_section = re.search(
-        r'#\s*PACKAGES[\s\S]*?(?=FREIGHT CHARGES:|TOTAL|RECEIVED|$)',
-        page_text,
-        re.IGNORECASE
-    )
-
-    if item_section:
-        item_text = item_section.group(0)
-
-        # Extract item details into a dictionary first
-        item_data = {}
-
-        # Description with NMFC
-        nmfc_match = re.search(r'NMFC\s*#([\d-]+)[,\s]+([^,\n]+)', item_text)
-        if nmfc_match:
-            item_data['nmfc_code'] = nmfc_match.group(1)
-            description = nmfc_match.group(2).strip()
-            # Clean up description
-            item_data['description'] = re.sub(r'PCF.*$', '', description).strip()
-
-        # Quantity and type
-        qty_match = re.search(r'(\d+)\s+(Pallets?|Cartons?|Boxes?|Pieces?)', item_text, re.IGNORECASE)
-        if qty_match:
-            item_data['quantity'] = int(qty_match.group(1))
-            item_data['packaging_type'] = qty_match.group(2).rstrip('s')
-
-        # Weight
-        weight_match = re.search(r'(\d+)\s*lbs', item_text, re.IGNORECASE)
-        if weight_match:
-            item_data['weight'] = float(weight_match.group(1))
-            item_data['weight_unit'] = "LBS"
-
-        # Class
-        class_match = re.search(r'CLASS\s*\n?\s*(\d+)', item_text)
-        if class_match:
-            item_data['freight_class'] = class_match.group(1)
-
-        # Dimensions
-        dim_match = re.search(r'(\d+)\s*x\s*(\d+)\s*x\s*(\d+)', item_text)
-        if dim_match:
-            item_data['dimensions'] = f"{dim_match.group(1)}x{dim_match.group(2)}x{dim_match.group(3)}"
-
-        # Only create ShipmentItem if we have a description (required field)
-        if item_data.get('description'):
-            item = ShipmentItem(**item_data)
-            items.append(item)
-        elif item_data.get('nmfc_code'):
-            # If we only have NMFC code but no description, use a generic description
-            item_data['description'] = f"Item with NMFC #{item_data['nmfc_code']}"
-            item = ShipmentItem(**item_data)
-            items.append(item)
-
-    return items
+from app.parsing.bol_regex import extract_items_from_page_text
 
 # Test with problematic BOL text
 test_text = """
@@ -1,100 +1,7 @@
 #!/usr/bin/env python3
 """Test the improved shipper and consignee extraction"""
 
-import re
-from typing import Dict, Any
-
-def extract_from_text_fixed(text: str) -> Dict[str, Any]:
-    """Extract BOL data with fixed patterns"""
-    entities = {}
-
-    # Extract shipper info - look for ORIGIN: section
-    origin_section = re.search(
-        r'ORIGIN:[\s\n]+([^\n]+)[\s\n]+(\d+[^\n]+)[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})',
-        text
-    )
-
-    if origin_section:
-        # Extract shipper name (first line after ORIGIN:)
-        entities['shipper_name'] = origin_section.group(1).strip()
-        # Extract street address
-        entities['shipper_street'] = origin_section.group(2).strip()
-        # Extract city, state, zip
-        city_state_zip = origin_section.group(3).strip()
-        city_state_match = re.match(r'([^,]+),\s*([A-Z]{2})\s+(\d{5})', city_state_zip)
-        if city_state_match:
-            entities['shipper_city'] = city_state_match.group(1)
-            entities['shipper_state'] = city_state_match.group(2)
-            entities['shipper_zip'] = city_state_match.group(3)
-
-    # Extract shipper contact
-    shipper_patterns = [
-        r'([A-Z][a-z]+\s+[A-Z][a-z]+)[\s\n]+(\d{3}[-.]?\d{3}[-.]?\d{4})',
-        r'(\d{3}[-.]?\d{3}[-.]?\d{4})',  # Just phone
-    ]
-
-    for pattern in shipper_patterns:
-        shipper_contact = re.search(pattern, text)
-        if shipper_contact:
-            if len(shipper_contact.groups()) > 1:
-                entities['shipper_contact_name'] = shipper_contact.group(1)
-                entities['shipper_contact_phone'] = shipper_contact.group(2).replace('.', '-')
-            else:
-                entities['shipper_contact_phone'] = shipper_contact.group(1).replace('.', '-')
-            break
-
-    # Extract consignee name
-    consignee_patterns = [
-        r'(\d+)\s*[-–]\s*([^\n]*Scheels)',  # Format: "48 - Sioux Falls Scheels"
-        r'CONSIGNEE:[\s\n]+(\d+\s*[-–]\s*[^\n]+)',
-        r'CONSIGNEE:[\s\n]+([^\n]+)',
-    ]
-    for pattern in consignee_patterns:
-        consignee_match = re.search(pattern, text)
-        if consignee_match:
-            if len(consignee_match.groups()) > 1 and 'Scheels' in pattern:
-                entities['consignee_name'] = consignee_match.group(2).strip()
-            else:
-                consignee_text = consignee_match.group(1).strip()
-                consignee_text = re.sub(r'^\d+\s*[-–]\s*', '', consignee_text)
-                if consignee_text and 'DOCK TYPE' not in consignee_text:
-                    entities['consignee_name'] = consignee_text
-            break
-
-    # Extract complete consignee section
-    consignee_block = re.search(
-        r'CONSIGNEE:[\s\n]+([\s\S]*?)(?:DOCK TYPE|ACCESS\.|DELIVERY #|PICK UP #|NOTES|FREIGHT)',
-        text
-    )
-
-    if consignee_block:
-        consignee_text = consignee_block.group(1)
-
-        # Extract address
-        addr_match = re.search(
-            r'(\d+[^\n]+(?:Street|St|Avenue|Ave|Road|Rd|Drive|Dr|Boulevard|Blvd|Circle|Way)[^\n]*)(?:[\s\n]+(?:Ste|Suite|Apt|Unit)\s+[^\n]+)?[\s\n]+([^,\n]+,\s*[A-Z]{2}\s+\d{5})',
-            consignee_text
-        )
-
-        if addr_match:
-            street = addr_match.group(1).strip()
-            # Check if there's a suite/apt on the next line
-            suite_match = re.search(
-                r'(\d+[^\n]+)[\s\n]+((?:Ste|Suite|Apt|Unit)\s+[^\n]+)',
-                consignee_text
-            )
-            if suite_match and suite_match.group(1) in street:
-                street = f"{street}, {suite_match.group(2).strip()}"
-
-            entities['consignee_street'] = street
-            city_state_zip = addr_match.group(2).strip()
-            city_state_match = re.match(r'([^,]+),\s*([A-Z]{2})\s+(\d{5})', city_state_zip)
-            if city_state_match:
-                entities['consignee_city'] = city_state_match.group(1)
-                entities['consignee_state'] = city_state_match.group(2)
-                entities['consignee_zip'] = city_state_match.group(3)
-
-    return entities
+from app.parsing.bol_regex import extract_from_text_fixed
 
 # Test Case 1: Original problematic BOL (SHARKNINJA)
 test1 = """CONSIGNEE INFORMATION
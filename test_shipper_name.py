@@ -3,30 +3,11 @@
 
 import re
 
+from app.parsing.bol_regex import BOLView
+
 def test_shipper_extraction(text):
     """Test current shipper extraction logic"""
-    entities = {}
-
-    # Current patterns
-    shipper_patterns = [
-        r'SHIPPER INFORMATION[\s\n]+([A-Z][A-Z\s]+(?:COMPANY|SALES|LLC|INC|CORP)?[^\n]*)',
-        r'ORIGIN:[\s\n]+MOTIVATIONAL FULFILLMENT',
-    ]
-
-    for pattern in shipper_patterns:
-        shipper_match = re.search(pattern, text)
-        if shipper_match:
-            if 'ORIGIN:' in pattern:
-                entities['shipper_name'] = 'MOTIVATIONAL FULFILLMENT'
-            else:
-                shipper_name = shipper_match.group(1).strip()
-                # Clean up the name
-                shipper_name = re.sub(r'/\s*C\/O.*$', '', shipper_name).strip()
-                if shipper_name and 'CONSIGNEE' not in shipper_name:
-                    entities['shipper_name'] = shipper_name
-            break
-
-    return entities.get('shipper_name')
+    return BOLView(text).get('shipper_name')
 
 # Test cases
 test_cases = [